@@ -9,32 +9,92 @@ from tools.check_health import CheckServiceHealthTool
 from tools.check_db import CheckDatabaseConnectionTool
 from tools.calculate_score import CalculateReadinessScoreTool
 from services.drivers.notification_driver import WebhookDriver
+from services.drivers._http import aclose_shared_client
+from services.drivers.health_driver import DatabaseDriver
+import asyncio
 import logging
 import os
 import json
+import sys
+
+# Tool names, interned once so registry lookups compare by identity
+FETCH_BUILD_LOG = sys.intern("fetch_build_log")
+GET_LATEST_BUILD = sys.intern("get_latest_build")
+ANALYZE_BUILD_LOG = sys.intern("analyze_build_log")
+FETCH_ENVIRONMENT_CONFIG = sys.intern("fetch_environment_config")
+COMPARE_ENVIRONMENT_CONFIGS = sys.intern("compare_environment_configs")
+CHECK_SERVICE_HEALTH = sys.intern("check_service_health")
+CHECK_DATABASE_CONNECTION = sys.intern("check_database_connection")
+CALCULATE_READINESS_SCORE = sys.intern("calculate_readiness_score")
 
 class DeploymentAgent:
     MAX_TOOL_CALLS = 10
+    TOOL_TIMEOUT_SECONDS = 60
+    # evaluate_build's widest fan-out: the log fetch/analyze chain plus four environment checks
+    MAX_CONCURRENT_TOOLS = 5
 
     def __init__(self, config: dict = None):
         self.config = config or {}
         self.registry = ToolRegistry()
         self.context = AgentContext()
+        # Tools and drivers look up the process-wide pooled client when they send, so a client
+        # recreated after aclose() (e.g. a new HTTP/SSE session) is picked up automatically
         self.notifier = WebhookDriver()
+        # Background webhook sends; kept referenced so they are not garbage-collected mid-flight
+        self._pending_notifications = set()
         self._register_all_tools()
         self.logger = logging.getLogger("agent")
         self.logger.setLevel(logging.INFO)
         self.call_count = 0
+        # Caps in-flight tool executions so concurrent fan-out respects downstream rate limits
+        self._semaphore = asyncio.Semaphore(self.MAX_CONCURRENT_TOOLS)
+
+    @property
+    def config(self) -> dict:
+        return self._config
+
+    @config.setter
+    def config(self, value: dict):
+        # Reloading the schema (e.g. via initialize_config) invalidates resolved environments
+        self._config = value
+        self._env_cache = {}
+
+    def _resolve_env(self, project: str, environment: str) -> dict:
+        """Resolves (and memoizes) the per-environment settings used on every tool call."""
+        key = (project, environment)
+        resolved = self._env_cache.get(key)
+        if resolved is None:
+            project_config = self._config.get("projects", {}).get(project, {})
+            environments = project_config.get("environments", {})
+            env_config = environments.get(environment, {})
+            resolved = {
+                "repo": project_config.get("repo", "unknown/repo"),
+                "template_file": env_config.get("config_template"),
+                "health_url": env_config.get("health_url"),
+                "db_url": env_config.get("db_url", "none"),
+                "service_name": f"{project.capitalize()} ({environment})",
+                "is_single_env": len(environments) <= 1
+            }
+            self._env_cache[key] = resolved
+        return resolved
 
     def _register_all_tools(self):
-        self.registry.register_tool("fetch_build_log", FetchBuildLogTool())
-        self.registry.register_tool("get_latest_build", GetLatestBuildTool())
-        self.registry.register_tool("analyze_build_log", AnalyzeBuildLogTool())
-        self.registry.register_tool("fetch_environment_config", FetchEnvironmentConfigTool())
-        self.registry.register_tool("compare_environment_configs", CompareEnvironmentConfigsTool())
-        self.registry.register_tool("check_service_health", CheckServiceHealthTool())
-        self.registry.register_tool("check_database_connection", CheckDatabaseConnectionTool())
-        self.registry.register_tool("calculate_readiness_score", CalculateReadinessScoreTool())
+        self.registry.register_tool(FETCH_BUILD_LOG, FetchBuildLogTool())
+        self.registry.register_tool(GET_LATEST_BUILD, GetLatestBuildTool())
+        self.registry.register_tool(ANALYZE_BUILD_LOG, AnalyzeBuildLogTool())
+        self.registry.register_tool(FETCH_ENVIRONMENT_CONFIG, FetchEnvironmentConfigTool())
+        self.registry.register_tool(COMPARE_ENVIRONMENT_CONFIGS, CompareEnvironmentConfigsTool())
+        self.registry.register_tool(CHECK_SERVICE_HEALTH, CheckServiceHealthTool())
+        self.registry.register_tool(CHECK_DATABASE_CONNECTION, CheckDatabaseConnectionTool())
+        self.registry.register_tool(CALCULATE_READINESS_SCORE, CalculateReadinessScoreTool())
+        self.registry.freeze()
+
+    async def aclose(self):
+        """Releases pooled network resources. Call once on server shutdown."""
+        if self._pending_notifications:
+            await asyncio.gather(*self._pending_notifications, return_exceptions=True)
+        await aclose_shared_client()
+        await DatabaseDriver.aclose_all()
 
     async def evaluate_build(self, project: str, build_id: str, environment: str) -> dict:
         self.context.clear()
@@ -48,81 +108,89 @@ class DeploymentAgent:
                 }
             }
 
-        project_config = self.config.get("projects", {}).get(project, {})
-        env_config = project_config.get("environments", {}).get(environment, {})
-
-        repo = project_config.get("repo", "unknown/repo")
-        self.logger.info(f"Starting evaluation for {project} (repo: {repo}) build {build_id} in {environment}")
+        env = self._resolve_env(project, environment)
+        repo = env["repo"]
+        self.logger.info("Starting evaluation for %s (repo: %s) build %s in %s", project, repo, build_id, environment)
 
         try:
-            # 1. Fetch Log (Pass repo to driver)
-            log_res = await self._execute_tool_call("fetch_build_log", {"build_id": build_id, "repo": repo})
-            if not log_res["success"]: return self._finalize_error("Failed to fetch log", log_res)
-            log_text = log_res["data"]["log_text"]
-
-            # 2. Analyze Log
-            analysis_res = await self._execute_tool_call("analyze_build_log", {"log_text": log_text})
-            if not analysis_res["success"]: return self._finalize_error("Failed to analyze log", analysis_res)
-            
-            # 3. Fetch Config
-            config_res = await self._execute_tool_call("fetch_environment_config", {"environment": environment})
-            
-            # 4. Compare Config
-            template_file = env_config.get("config_template")
-            drift_res = await self._execute_tool_call("compare_environment_configs", {
-                "env_1": environment, 
-                "env_2": template_file
-            })
-
-            # 5. Check Service Health
-            health_url = env_config.get("health_url")
-            health_res = await self._execute_tool_call("check_service_health", {
-                "service_name": f"{project.capitalize()} ({environment})", 
-                "health_url": health_url
-            })
-
-            # 6. Check DB
-            db_url = env_config.get("db_url", "none")
-            db_res = await self._execute_tool_call("check_database_connection", {"environment": environment})
-
-            # 7. Final Scoring
-            score_res = await self._execute_tool_call("calculate_readiness_score", {
-                "log_analysis": analysis_res["data"],
-                "drift_analysis": drift_res["data"] if drift_res["success"] else {},
-                "health_checks": [health_res["data"]] if health_res["success"] else [],
-                "db_status": db_res["data"]["db_status"] if (db_res["success"] and db_url != "none") else "SAFE"
-            })
-
-            # 8. Enrich with Audit Report
-            if score_res["success"]:
-                score_res["data"]["audit_report"] = {
-                    "build_analysis": analysis_res["data"],
-                    "config_audit": drift_res.get("data", {}),
-                    "health_status": health_res.get("data", {}),
-                    "db_connectivity": db_res.get("data", {})
-                }
+            # 3-6. Config, drift, health and DB checks don't depend on the build log,
+            # so start them now and let them overlap with the fetch + analyze chain.
+            db_url = env["db_url"]
+            checks = asyncio.gather(
+                self._execute_tool_call_with_timeout(FETCH_ENVIRONMENT_CONFIG, {"environment": environment}),
+                self._execute_tool_call_with_timeout(COMPARE_ENVIRONMENT_CONFIGS, {
+                    "env_1": environment, 
+                    "env_2": env["template_file"]
+                }),
+                self._execute_tool_call_with_timeout(CHECK_SERVICE_HEALTH, {
+                    "service_name": env["service_name"], 
+                    "health_url": env["health_url"]
+                }),
+                self._execute_tool_call_with_timeout(CHECK_DATABASE_CONNECTION, {"environment": environment})
+            )
+
+            # Every exit below (early error return, exception, or the request being cancelled)
+            # must not leave the checks running and writing into self.context
+            try:
+                # 1. Fetch Log (Pass repo to driver)
+                log_res = await self._execute_tool_call(FETCH_BUILD_LOG, {
+                    "build_id": build_id, "repo": repo, "max_chars": AnalyzeBuildLogTool.MAX_LOG_CHARS
+                })
+                if not log_res["success"]:
+                    return self._finalize_error("Failed to fetch log", log_res)
+                log_text = log_res["data"]["log_text"]
+
+                # 2. Analyze Log
+                analysis_res = await self._execute_tool_call(ANALYZE_BUILD_LOG, {"log_text": log_text})
+                if not analysis_res["success"]:
+                    return self._finalize_error("Failed to analyze log", analysis_res)
+
+                config_res, drift_res, health_res, db_res = await checks
 
-                # 9. Human-in-the-loop Notification
-                data = score_res["data"]
-                self.notifier.send_deployment_alert(
-                    score=data["readiness_score"],
-                    status=data["status"],
-                    summary=analysis_res["data"]["explanation"],
-                    recommendations=data["penalties"]
-                )
+                # 7. Final Scoring
+                score_res = await self._execute_tool_call(CALCULATE_READINESS_SCORE, {
+                    "log_analysis": analysis_res["data"],
+                    "drift_analysis": drift_res["data"] if drift_res["success"] else {},
+                    "health_checks": [health_res["data"]] if health_res["success"] else [],
+                    "db_status": db_res["data"]["db_status"] if (db_res["success"] and db_url != "none") else "SAFE"
+                })
 
-            return score_res
+                # 8. Enrich with Audit Report
+                if score_res["success"]:
+                    score_res["data"]["audit_report"] = {
+                        "build_analysis": analysis_res["data"],
+                        "config_audit": drift_res.get("data", {}),
+                        "health_status": health_res.get("data", {}),
+                        "db_connectivity": db_res.get("data", {})
+                    }
+
+                    # 9. Human-in-the-loop Notification (sent in the background, off the response path)
+                    data = score_res["data"]
+                    task = asyncio.create_task(self.notifier.send_deployment_alert(
+                        score=data["readiness_score"],
+                        status=data["status"],
+                        summary=analysis_res["data"]["explanation"],
+                        recommendations=data["penalties"]
+                    ))
+                    self._pending_notifications.add(task)
+                    task.add_done_callback(self._pending_notifications.discard)
+
+                return score_res
+            finally:
+                if not checks.done():
+                    await self._cancel_pending(checks)
 
         except Exception as e:
             self.logger.exception("Agent execution failed")
             return {"success": False, "error": {"code": "AGENT_ERROR", "message": str(e)}}
 
     async def verify_build(self, project: str, build_id: str) -> dict:
-        project_config = self.config.get("projects", {}).get(project, {})
-        repo = project_config.get("repo", "unknown/repo")
-        log_res = await self._execute_tool_call("fetch_build_log", {"build_id": build_id, "repo": repo})
+        repo = self._resolve_env(project, None)["repo"]
+        log_res = await self._execute_tool_call(FETCH_BUILD_LOG, {
+            "build_id": build_id, "repo": repo, "max_chars": AnalyzeBuildLogTool.MAX_LOG_CHARS
+        })
         if not log_res["success"]: return log_res
-        analysis_res = await self._execute_tool_call("analyze_build_log", {"log_text": log_res["data"]["log_text"]})
+        analysis_res = await self._execute_tool_call(ANALYZE_BUILD_LOG, {"log_text": log_res["data"]["log_text"]})
         return analysis_res
 
     async def verify_config(self, project: str, environment: str) -> dict:
@@ -140,13 +208,11 @@ class DeploymentAgent:
             
         # Smart Awareness: If only one environment is defined, we do an Integrity Check
         # (check if values are filled/valid) rather than just a key-drift check.
-        is_single_env = len(project_config.get("environments", {})) <= 1
-        
-        template_file = env_config.get("config_template")
-        drift_res = await self._execute_tool_call("compare_environment_configs", {
+        env = self._resolve_env(project, environment)
+        drift_res = await self._execute_tool_call(COMPARE_ENVIRONMENT_CONFIGS, {
             "env_1": environment, 
-            "env_2": template_file,
-            "integrity_mode": is_single_env
+            "env_2": env["template_file"],
+            "integrity_mode": env["is_single_env"]
         })
         return drift_res
 
@@ -163,17 +229,30 @@ class DeploymentAgent:
         if not env_config: 
             return {"success": False, "error": {"message": f"Environment '{environment}' not found for project '{project}'"}}
             
-        health_url = env_config.get("health_url")
-        health_res = await self._execute_tool_call("check_service_health", {
-            "service_name": f"{project.capitalize()} ({environment})", 
-            "health_url": health_url
+        env = self._resolve_env(project, environment)
+        health_res = await self._execute_tool_call(CHECK_SERVICE_HEALTH, {
+            "service_name": env["service_name"], 
+            "health_url": env["health_url"]
         })
         return health_res
 
+    async def verify_all(self, project: str, environment: str, build_id: str) -> dict:
+        """Runs the build, config and health verifications concurrently."""
+        build_res, config_res, health_res = await asyncio.gather(
+            self.verify_build(project, build_id),
+            self.verify_config(project, environment),
+            self.verify_health(project, environment)
+        )
+        return {
+            "build": build_res,
+            "config": config_res,
+            "health": health_res
+        }
+
     async def _execute_tool_call(self, tool_name: str, arguments: dict) -> dict:
         self.call_count += 1
         if self.call_count > self.MAX_TOOL_CALLS:
-            self.logger.warning(f"MAX_TOOL_CALLS ({self.MAX_TOOL_CALLS}) exceeded. Aborting to prevent loop.")
+            self.logger.warning("MAX_TOOL_CALLS (%s) exceeded. Aborting to prevent loop.", self.MAX_TOOL_CALLS)
             return {
                 "success": False, 
                 "error": {
@@ -182,20 +261,41 @@ class DeploymentAgent:
                 }
             }
 
-        self.logger.info(f"Invoking tool: {tool_name} (Call {self.call_count}/{self.MAX_TOOL_CALLS})")
+        self.logger.info("Invoking tool: %s (Call %s/%s)", tool_name, self.call_count, self.MAX_TOOL_CALLS)
         tool = self.registry.get_tool(tool_name)
         if not tool:
             return {"success": False, "error": {"code": "TOOL_NOT_FOUND", "message": f"Tool {tool_name} not found"}}
         
-        result = await tool.execute(**arguments)
+        async with self._semaphore:
+            result = await tool.execute(**arguments)
         
         # Log only success status for concise output
         status = "✓ SUCCESS" if result.get("success") else "✗ FAILED"
-        self.logger.info(f"Tool {tool_name} {status}")
+        self.logger.info("Tool %s %s", tool_name, status)
         
         self.context.add_tool_result(tool_name, result)
         return result
 
+    async def _execute_tool_call_with_timeout(self, tool_name: str, arguments: dict) -> dict:
+        """Runs a tool call under TOOL_TIMEOUT_SECONDS, folding failures into the standard error shape."""
+        try:
+            return await asyncio.wait_for(self._execute_tool_call(tool_name, arguments), timeout=self.TOOL_TIMEOUT_SECONDS)
+        except asyncio.TimeoutError:
+            self.logger.warning("Tool %s timed out after %ss", tool_name, self.TOOL_TIMEOUT_SECONDS)
+            return {
+                "success": False,
+                "error": {"code": "TOOL_TIMEOUT", "message": f"Tool {tool_name} timed out after {self.TOOL_TIMEOUT_SECONDS}s"}
+            }
+        except Exception as e:
+            self.logger.exception("Tool %s raised an unexpected error", tool_name)
+            return {"success": False, "error": {"code": "TOOL_ERROR", "message": str(e)}}
+
+    @staticmethod
+    async def _cancel_pending(future):
+        """Cancels in-flight checks that are no longer needed and reaps their result."""
+        future.cancel()
+        await asyncio.gather(future, return_exceptions=True)
+
     def _finalize_error(self, message: str, tool_result: dict):
         error_data = tool_result.get("error", {})
         return {
@@ -1,12 +1,26 @@
+from types import MappingProxyType
+
+
 class AgentContext:
     def __init__(self):
         self._results = {}
+        self._shared = False  # a snapshot proxy views the current dict
 
     def add_tool_result(self, tool_name: str, result: dict):
+        if self._shared:
+            # Copy-on-write: leave the dict behind outstanding snapshots untouched
+            self._results = dict(self._results)
+            self._shared = False
         self._results[tool_name] = result
 
-    def get_context_snapshot(self) -> dict:
-        return self._results.copy()
+    def get_context_snapshot(self) -> MappingProxyType:
+        # Read-only view; no copy is made unless the context is written afterwards
+        self._shared = True
+        return MappingProxyType(self._results)
 
     def clear(self):
-        self._results = {}
+        if self._shared:
+            self._results = {}
+            self._shared = False
+        else:
+            self._results.clear()
@@ -1,12 +1,24 @@
+from types import MappingProxyType
+import sys
+
 class ToolRegistry:
     def __init__(self):
         self._tools = {}
+        self._frozen = False
 
     def register_tool(self, tool_name: str, handler):
-        self._tools[tool_name] = handler
+        if self._frozen:
+            raise RuntimeError(f"Cannot register '{tool_name}': tool registry is frozen")
+        # Interned keys let lookups with the agent's interned constants match on identity
+        self._tools[sys.intern(tool_name)] = handler
+
+    def freeze(self):
+        """Locks the tool table once registration is complete; lookups stay a single hash probe."""
+        self._tools = MappingProxyType(dict(self._tools))
+        self._frozen = True
 
     def get_tool(self, tool_name: str):
         return self._tools.get(tool_name)
 
     def list_tools(self) -> list:
-        return list(self._tools.keys())
+        return list(self._tools.keys())
\ No newline at end of file
@@ -1,5 +1,6 @@
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional, Any
+from dataclasses import dataclass
 from enum import Enum
 
 # --- Tool Output Enums ---
@@ -25,6 +26,10 @@ class Recommendation(str, Enum):
     ALLOW_AUTOMATION = "ALLOW_AUTOMATION"
     BLOCK_AUTOMATION = "BLOCK_AUTOMATION"
 
+# Precomputed value sets for cheap "is this a valid X" checks on raw strings
+LOG_CATEGORY_VALUES = frozenset(c.value for c in LogCategory)
+SEVERITY_VALUES = frozenset(s.value for s in Severity)
+
 # --- Tool Result Models ---
 
 class LogAnalysisResult(BaseModel):
@@ -79,7 +84,12 @@ class DiscoveryResult(BaseModel):
     message: str
     discovered_projects: List[str]
 
-class ToolResponse(BaseModel):
+# --- Internal Wrappers ---
+# Built on every tool call and never exposed as an MCP schema, so a slotted
+# dataclass is used instead of a validating Pydantic model.
+
+@dataclass(slots=True)
+class ToolResponse:
     """Universal wrapper for all tool responses to ensure consistent IDE parsing."""
     success: bool
     data: Optional[Any] = None
@@ -1,12 +1,9 @@
 #!/usr/bin/env python3
-from mcp.server.fastmcp import FastMCP
-from agent.agent_controller import DeploymentAgent
-from services.config_loader import ConfigLoader, ConfigError
-from models import ToolResponse, ServerHealth, DiscoveryResult
+# Heavy imports (FastMCP, the agent, dotenv) are deferred into run_server() so the
+# --init-config CLI path does not pay for them.
 import logging
 import sys
 import os
-from dotenv import load_dotenv
 
 # Configure Logging early - reduce verbosity
 # Set root logger to WARNING to suppress verbose logs from dependencies
@@ -23,54 +20,175 @@ logging.getLogger("mcp").setLevel(logging.WARNING)
 logger = logging.getLogger("mcp_server")
 logger.setLevel(logging.INFO)
 
-# Load environment variables - prioritize current working directory over script directory
-# This allows .env files in the user's project folder to be loaded when running via npx
-# Supports .env, .env.local, .env.production, .env.development, etc.
-import glob
-
-search_dirs = [
-    os.getcwd(),  # Current working directory (user's project)
-    os.path.dirname(os.path.abspath(__file__))  # Script directory
-]
-
-loaded_files = []
-for search_dir in search_dirs:
-    # Find all .env* files in this directory
-    env_files = glob.glob(os.path.join(search_dir, '.env*'))
-    
-    # Sort to prioritize: .env, .env.local, .env.production, etc.
+def _discover_env_files(search_dir: str) -> list:
+    """
+    Lists .env* files in a directory with a single scandir pass.
+    Sorted so .env comes first, then .env.local, .env.production, etc. alphabetically.
+    """
+    try:
+        with os.scandir(search_dir) as entries:
+            env_files = [
+                entry.path for entry in entries
+                if entry.name.startswith('.env') and entry.is_file()  # Skip directories
+            ]
+    except OSError:
+        return []
     env_files.sort(key=lambda x: (
         0 if os.path.basename(x) == '.env' else 1,  # .env first
         os.path.basename(x)  # Then alphabetically
     ))
-    
-    for env_file in env_files:
-        if os.path.isfile(env_file):  # Skip directories
+    return env_files
+
+def load_env_files() -> list:
+    """
+    Load environment variables - prioritize current working directory over script directory.
+    This allows .env files in the user's project folder to be loaded when running via npx.
+    Supports .env, .env.local, .env.production, .env.development, etc.
+    """
+    from dotenv import load_dotenv
+
+    search_dirs = [
+        os.getcwd(),  # Current working directory (user's project)
+        os.path.dirname(os.path.abspath(__file__))  # Script directory
+    ]
+
+    loaded_files = []
+    for search_dir in search_dirs:
+        for env_file in _discover_env_files(search_dir):
             load_dotenv(dotenv_path=env_file, override=False)
             loaded_files.append(env_file)
-    
+        
+        if loaded_files:
+            break  # Stop after first directory with .env files
+
     if loaded_files:
-        break  # Stop after first directory with .env files
+        # Later load_dotenv_once() calls (LLM client, config loader) skip re-parsing
+        from services.env_loader import ENV_LOADED_MARKER
+        os.environ[ENV_LOADED_MARKER] = "1"
+    else:
+        logger.warning(f"⚠️  No .env* files found in: {search_dirs}")
+        logger.info("Environment variables can also be set in MCP client settings.")
+    return loaded_files
+
+# Agent tools exposed 1:1 over MCP: (name, parameters taken from the tool's execute(), docstring)
+PASSTHROUGH_TOOLS = [
+    ("fetch_build_log", ("build_id", "repo"), "Fetch build logs from the CI system."),
+    ("get_latest_build", ("repo", "workflow_name", "branch", "include_log"), """
+        Automatically fetch and analyze the latest GitHub Actions build.
+        No manual run_id required - intelligently discovers the most recent workflow run.
+        
+        Args:
+            repo: Repository (owner/repo format). Defaults to GITHUB_REPOSITORY env var.
+            workflow_name: Optional workflow filter (e.g., "nextjs-build" or "Next.js Build")
+            branch: Optional branch filter (e.g., "main")
+            include_log: Whether to fetch full log text (default: True)
+        
+        Returns:
+            Latest build status with AI-powered analysis of failures.
+        """),
+    ("analyze_build_log", ("log_text",), "Use AI to classify the build log and determine the root cause of failures."),
+    ("check_service_health", ("service_name", "health_url"), "Check the health status and latency of a specific service."),
+    ("check_database_connection", ("environment", "db_url"), """
+        Test database connectivity and migration status.
+        Supports PostgreSQL, MySQL, and MongoDB with auto-detection.
+        
+        Args:
+            environment: Environment name (used for logging/context)
+            db_url: Optional database connection string. If not provided, uses TARGET_DB_URL from environment variables.
+                   Examples: postgresql://..., mysql://..., mongodb+srv://...
+        
+        Returns:
+            Database connection status, latency, and migration verification with AI assessment.
+        """),
+    ("calculate_readiness_score", ("log_analysis", "drift_analysis", "health_checks", "db_status"),
+     "Calculate the final readiness score based on all analysis results."),
+]
 
-if not loaded_files:
-    logger.warning(f"⚠️  No .env* files found in: {search_dirs}")
-    logger.info("Environment variables can also be set in MCP client settings.")
+# DeploymentAgent coroutines exposed as MCP tools under their method name: (name, description)
+AGENT_TOOLS = [
+    ("evaluate_build", """
+        Orchestrates the full deployment readiness assessment for a specific project, build, and environment.
+        Calls CI logs, AI analysis, config drift detection, and health checks.
+        """),
+    ("verify_build", "Just verify the build logs and root cause using AI."),
+    ("verify_config", "Just verify configuration drift for a project and environment."),
+    ("verify_health", "Just verify health and connectivity for a project and environment."),
+    ("verify_all", "Verify build logs, configuration drift and service health in parallel."),
+]
+
+# initialize_config and server_health are defined inside run_server()
+TOOLS_REGISTERED = 2 + len(AGENT_TOOLS) + len(PASSTHROUGH_TOOLS)
+
+def _make_passthrough_tool(agent: "DeploymentAgent", name: str, params: tuple, doc: str):
+    """Builds an MCP handler that forwards its arguments to agent._execute_tool_call(name, ...)."""
+    import inspect
+
+    async def handler(**arguments) -> dict:
+        return await agent._execute_tool_call(name, arguments)
+
+    # FastMCP derives the input schema from the signature, so mirror the tool's own parameters
+    execute_sig = inspect.signature(agent.registry.get_tool(name).execute)
+    handler.__signature__ = execute_sig.replace(
+        parameters=[execute_sig.parameters[p] for p in params],
+        return_annotation=dict
+    )
+    handler.__name__ = name
+    handler.__doc__ = doc
+    return handler
+
+def _install_uvloop():
+    """Use uvloop's libuv-based event loop when available (not supported on Windows)."""
+    if sys.platform == "win32":
+        return
+    try:
+        import uvloop
+    except ImportError:
+        return
+    import asyncio
+    asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
 
 def run_server():
-    # 1. Handle Initialization CLI Command
+    # 1. Handle Initialization CLI Command (needs neither the MCP stack nor .env)
     if "--init-config" in sys.argv:
+        from services.config_loader import ConfigLoader
         ConfigLoader.generate_default_config()
         sys.exit(0)
 
+    import asyncio
+    from contextlib import asynccontextmanager
+    from mcp.server.fastmcp import FastMCP
+    from agent.agent_controller import DeploymentAgent
+    from services.config_loader import ConfigLoader
+    from models import ServerHealth, DiscoveryResult
+
+    _install_uvloop()
+    load_env_files()
+
     # 2. Production Config Loading (Graceful)
     # We load with fail_fast=False to allow the server to start even if files are missing.
     loader = ConfigLoader()
     config = loader.load(fail_fast=False)
 
     # 3. Initialize Agent and Server
-    mcp = FastMCP("Readiness Assistant")
     agent = DeploymentAgent(config=config)
 
+    @asynccontextmanager
+    async def lifespan(server):
+        try:
+            yield
+        finally:
+            await agent.aclose()
+
+    mcp = FastMCP("Readiness Assistant", lifespan=lifespan)
+
+    # Health only reflects startup state (and initialize_config), so build it once
+    health = ServerHealth(
+        status="UP",
+        tools_registered=TOOLS_REGISTERED,
+        environment=os.getenv("APP_ENV", "production"),
+        config_loaded=loader.exists()
+    )
+
     @mcp.tool()
     async def initialize_config() -> DiscoveryResult:
         """
@@ -79,10 +197,13 @@ def run_server():
         """
         discovered = ConfigLoader.discover_workspace_projects()
         
-        ConfigLoader.generate_default_config(discovered_projects=discovered)
-        # Reload agent with new config
-        new_config = loader.load(fail_fast=True)
-        agent.config = new_config
+        new_config = ConfigLoader._build_default_config(discovered)
+        # Write off the event loop, then validate the in-memory copy instead of re-reading the file
+        await asyncio.get_running_loop().run_in_executor(
+            None, ConfigLoader._write_config, new_config, str(loader.config_path)
+        )
+        agent.config = loader.load_from_dict(new_config, fail_fast=True)
+        health.config_loaded = True
         
         return DiscoveryResult(
             success=True,
@@ -95,108 +216,15 @@ def run_server():
         """
         Returns the health status and telemetry of the Readiness Assistant server.
         """
-        try:
-            return ServerHealth(
-                status="UP",
-                tools_registered=10, # Static count of registered tools
-                environment=os.getenv("APP_ENV", "production"),
-                config_loaded=loader.exists()
-            )
-        except Exception as e:
-            logger.error(f"Health check failed: {e}")
-            raise
+        return health
 
-    @mcp.tool()
-    async def evaluate_build(project: str, build_id: str, environment: str) -> dict:
-        """
-        Orchestrates the full deployment readiness assessment for a specific project, build, and environment.
-        Calls CI logs, AI analysis, config drift detection, and health checks.
-        """
-        result = await agent.evaluate_build(project, build_id, environment)
-        return result
+    # Agent coroutines registered directly as bound methods; no extra wrapper frame per call
+    for name, doc in AGENT_TOOLS:
+        mcp.tool(name=name, description=doc)(getattr(agent, name))
 
     # Register individual tools as well if direct access is desired
-    @mcp.tool()
-    async def fetch_build_log(build_id: str, repo: str = None) -> dict:
-        """Fetch build logs from the CI system."""
-        return await agent._execute_tool_call("fetch_build_log", {"build_id": build_id, "repo": repo})
-
-    @mcp.tool()
-    async def get_latest_build(repo: str = None, workflow_name: str = None, 
-                              branch: str = None, include_log: bool = True) -> dict:
-        """
-        Automatically fetch and analyze the latest GitHub Actions build.
-        No manual run_id required - intelligently discovers the most recent workflow run.
-        
-        Args:
-            repo: Repository (owner/repo format). Defaults to GITHUB_REPOSITORY env var.
-            workflow_name: Optional workflow filter (e.g., "nextjs-build" or "Next.js Build")
-            branch: Optional branch filter (e.g., "main")
-            include_log: Whether to fetch full log text (default: True)
-        
-        Returns:
-            Latest build status with AI-powered analysis of failures.
-        """
-        return await agent._execute_tool_call("get_latest_build", {
-            "repo": repo,
-            "workflow_name": workflow_name,
-            "branch": branch,
-            "include_log": include_log
-        })
-
-    @mcp.tool()
-    async def analyze_build_log(log_text: str) -> dict:
-        """Use AI to classify the build log and determine the root cause of failures."""
-        return await agent._execute_tool_call("analyze_build_log", {"log_text": log_text})
-
-    @mcp.tool()
-    async def check_service_health(service_name: str, health_url: str) -> dict:
-        """Check the health status and latency of a specific service."""
-        return await agent._execute_tool_call("check_service_health", {"service_name": service_name, "health_url": health_url})
-
-    @mcp.tool()
-    async def check_database_connection(environment: str, db_url: str = None) -> dict:
-        """
-        Test database connectivity and migration status.
-        Supports PostgreSQL, MySQL, and MongoDB with auto-detection.
-        
-        Args:
-            environment: Environment name (used for logging/context)
-            db_url: Optional database connection string. If not provided, uses TARGET_DB_URL from environment variables.
-                   Examples: postgresql://..., mysql://..., mongodb+srv://...
-        
-        Returns:
-            Database connection status, latency, and migration verification with AI assessment.
-        """
-        return await agent._execute_tool_call("check_database_connection", {
-            "environment": environment,
-            "db_url": db_url
-        })
-
-    @mcp.tool()
-    async def verify_build(project: str, build_id: str) -> dict:
-        """Just verify the build logs and root cause using AI."""
-        return await agent.verify_build(project, build_id)
-
-    @mcp.tool()
-    async def verify_config(project: str, environment: str) -> dict:
-        """Just verify configuration drift for a project and environment."""
-        return await agent.verify_config(project, environment)
-
-    @mcp.tool()
-    async def verify_health(project: str, environment: str) -> dict:
-        """Just verify health and connectivity for a project and environment."""
-        return await agent.verify_health(project, environment)
-
-    @mcp.tool()
-    async def calculate_readiness_score(log_analysis: dict, drift_analysis: dict, health_checks: list, db_status: str) -> dict:
-        """Calculate the final readiness score based on all analysis results."""
-        return await agent._execute_tool_call("calculate_readiness_score", {
-            "log_analysis": log_analysis,
-            "drift_analysis": drift_analysis,
-            "health_checks": health_checks,
-            "db_status": db_status
-        })
+    for name, params, doc in PASSTHROUGH_TOOLS:
+        mcp.tool(name=name)(_make_passthrough_tool(agent, name, params, doc))
 
     mcp.run()
 
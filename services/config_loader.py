@@ -1,19 +1,116 @@
+import copy
+import functools
 import json
 import os
 from pathlib import Path
 import logging
-from dotenv import load_dotenv
 
-load_dotenv()
+try:
+    import orjson  # optional C-accelerated JSON
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger("config_loader")
 logger.setLevel(logging.WARNING)
 
+# Structure of readiness_schema.json, compiled to a validator when fastjsonschema is installed
+_SCHEMA = {
+    "type": "object",
+    "required": ["project_name", "projects", "mandatory_env_vars"],
+    "properties": {
+        "projects": {
+            "type": "object",
+            "additionalProperties": {
+                "type": "object",
+                "required": ["environments"],
+                "properties": {
+                    "environments": {
+                        "type": "object",
+                        "additionalProperties": {
+                            "type": "object",
+                            "required": ["health_url", "db_url", "config_template"]
+                        }
+                    }
+                }
+            }
+        }
+    }
+}
+
+try:
+    import fastjsonschema
+    _VALIDATE = fastjsonschema.compile(_SCHEMA)
+except ImportError:
+    fastjsonschema = None
+    _VALIDATE = None
+
+# Discovery Markers (insertion order is the overwrite priority used by discover_workspace_projects)
+_MARKERS = {
+    "package.json": {"type": "frontend", "hint": "React/Node"},
+    "pom.xml": {"type": "backend", "hint": "Spring Boot"},
+    "pyproject.toml": {"type": "backend", "hint": "Python"},
+    "requirements.txt": {"type": "backend", "hint": "Python"},
+    "Dockerfile": {"type": "service", "hint": "Containerized"},
+    "docker-compose.yml": {"type": "orchestration", "hint": "Docker Compose"},
+    "k8s": {"type": "infrastructure", "hint": "Kubernetes"},
+    ".github/workflows": {"type": "ci", "hint": "GitHub Actions"}
+}
+
+# Specificity of each project type; a more specific marker replaces a less specific one
+_RANK = {"service": 0, "ci": 1, "orchestration": 1, "infrastructure": 2, "frontend": 3, "backend": 3}
+
+# Tool and cache directories, skipped by name before descending. Generic names such as
+# build/, dist/ or env/ are deliberately absent: they can be real project folders.
+_PRUNE_DIRS = frozenset({
+    "node_modules", "target", ".venv", "venv", ".git",
+    "__pycache__", ".pytest_cache", ".mypy_cache", ".tox"
+})
+
+def _dumps_config(config: dict) -> bytes:
+    """Serializes a config with 2-space indentation, via orjson when available."""
+    if orjson:
+        return orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    return json.dumps(config, indent=2).encode("utf-8")
+
+# Starter config written by generate_default_config when no projects were discovered
+_DEFAULT_CONFIG_TEMPLATE = {
+    "project_name": "Enterprise Readiness Hub",
+    "projects": {
+        "frontend": {
+            "repo": "owner/frontend-react-app",
+            "environments": {
+                "staging": {
+                    "health_url": "http://localhost:8080/frontend/health",
+                    "db_url": "none",
+                    "config_template": "frontend-react-app/config/staging.json"
+                }
+            }
+        }
+    },
+    "mandatory_env_vars": [
+        "COHERE_API_KEY",
+        "GITHUB_TOKEN"
+    ],
+    "timeouts": {
+        "health_check_seconds": 10
+    }
+}
+_DEFAULT_CONFIG_BYTES = _dumps_config(_DEFAULT_CONFIG_TEMPLATE)
+
+@functools.lru_cache(maxsize=8)
+def _load_json_cached(path_str: str, mtime_ns: int, size: int) -> dict:
+    """Parses a config file once per (path, mtime, size); edits to the file change the key."""
+    data = Path(path_str).read_bytes()
+    return orjson.loads(data) if orjson else json.loads(data)
+
 class ConfigError(Exception):
     """Raised when configuration is invalid."""
     pass
 
 class ConfigLoader:
+    _REQUIRED_TOP_KEYS = ("project_name", "projects", "mandatory_env_vars")
+    _REQUIRED_ENV_KEYS = ("health_url", "db_url", "config_template")
+
     def __init__(self, config_path: str = "readiness_schema.json"):
         self.config_path = Path(config_path)
         self.config = None
@@ -31,6 +128,13 @@ class ConfigLoader:
             return {}
 
         self._read_json()
+        return self.load_from_dict(self.config, fail_fast=fail_fast)
+
+    def load_from_dict(self, config: dict, fail_fast: bool = True) -> dict:
+        """
+        Validates an in-memory configuration (e.g. one just generated) without reading it from disk.
+        """
+        self.config = config
         self._validate_structure()
         self._apply_env_overrides()
         self._validate_env_vars(fail_fast=fail_fast)
@@ -40,21 +144,33 @@ class ConfigLoader:
     def exists(self) -> bool:
         return self.config_path.exists()
 
+    @classmethod
+    def invalidate(cls):
+        """Drops cached parses, e.g. after the config file has been regenerated."""
+        _load_json_cached.cache_clear()
+
     def _read_json(self):
         try:
-            with open(self.config_path, "r") as f:
-                self.config = json.load(f)
-        except Exception as e:
+            st = self.config_path.stat()
+            # Deep copy: validation and overrides may mutate the returned config
+            self.config = copy.deepcopy(_load_json_cached(str(self.config_path), st.st_mtime_ns, st.st_size))
+        except FileNotFoundError:
+            raise ConfigError(f"Config file not found: {self.config_path}")
+        except ValueError as e:
+            # json.JSONDecodeError, orjson.JSONDecodeError and UnicodeDecodeError all subclass ValueError
             raise ConfigError(f"Invalid JSON format in {self.config_path}: {e}")
+        except OSError as e:
+            raise ConfigError(f"Could not read {self.config_path}: {e}")
 
     def _validate_structure(self):
-        required_top_keys = [
-            "project_name",
-            "projects",
-            "mandatory_env_vars"
-        ]
+        if _VALIDATE is not None:
+            try:
+                _VALIDATE(self.config)
+            except fastjsonschema.JsonSchemaException as e:
+                raise ConfigError(f"Invalid config structure: {e.message}")
+            return
 
-        for key in required_top_keys:
+        for key in self._REQUIRED_TOP_KEYS:
             if key not in self.config:
                 raise ConfigError(f"Missing required top-level key: '{key}'")
 
@@ -66,8 +182,7 @@ class ConfigLoader:
                 raise ConfigError(f"Project '{proj_name}' is missing 'environments' object")
             
             for env_name, env_data in proj_data["environments"].items():
-                required_env_keys = ["health_url", "db_url", "config_template"]
-                for key in required_env_keys:
+                for key in self._REQUIRED_ENV_KEYS:
                     if key not in env_data:
                         raise ConfigError(f"Project '{proj_name}' env '{env_name}' is missing required key: '{key}'")
 
@@ -79,13 +194,15 @@ class ConfigLoader:
         pass
 
     def _validate_env_vars(self, fail_fast: bool = True):
-        missing = []
-        for var in self.config.get("mandatory_env_vars", []):
-            if not os.getenv(var):
-                missing.append(var)
+        # Deferred so importing this module (e.g. for generate_default_config) stays cheap
+        from services.env_loader import load_dotenv_once
+        load_dotenv_once()
+
+        # Empty values count as missing
+        missing = [var for var in self.config.get("mandatory_env_vars", []) if not os.environ.get(var)]
 
         if missing:
-            message = "Missing required environment variables in .env:\n" + "\n".join([f" - {m}" for m in missing])
+            message = "Missing required environment variables in .env:\n" + "\n".join(f" - {m}" for m in missing)
             if fail_fast:
                 raise ConfigError(message)
             else:
@@ -98,37 +215,45 @@ class ConfigLoader:
         Returns a suggested project structure for readiness_schema.json.
         """
         discovered = {}
-        root = Path(root_dir)
         
-        # Discovery Markers
-        markers = {
-            "package.json": {"type": "frontend", "hint": "React/Node"},
-            "pom.xml": {"type": "backend", "hint": "Spring Boot"},
-            "pyproject.toml": {"type": "backend", "hint": "Python"},
-            "requirements.txt": {"type": "backend", "hint": "Python"},
-            "Dockerfile": {"type": "service", "hint": "Containerized"},
-            "docker-compose.yml": {"type": "orchestration", "hint": "Docker Compose"},
-            "k8s": {"type": "infrastructure", "hint": "Kubernetes"},
-            ".github/workflows": {"type": "ci", "hint": "GitHub Actions"}
-        }
+        # Single walk collecting the directories that contain each marker
+        hits = {marker: [] for marker in _MARKERS}
 
-        for marker_file, info in markers.items():
-            # Check for files or directories
-            search_pattern = f"**/{marker_file}"
-            for p in root.glob(search_pattern):
-                # Ignore common noise
-                if any(x in str(p) for x in ["node_modules", "target", ".venv", ".git"]):
+        def _walk(dirpath: str):
+            try:
+                with os.scandir(dirpath) as it:
+                    entries = list(it)
+            except OSError:
+                return
+            for entry in entries:
+                name = entry.name
+                if name in _PRUNE_DIRS:
                     continue
-                
-                # Use absolute path to get folder name if p.parent is "."
-                project_name = p.parent.resolve().name
+                if name in hits:
+                    hits[name].append(dirpath)
+                if entry.is_dir(follow_symlinks=False):
+                    # .github/workflows marks the project that owns the .github folder
+                    if name == ".github" and os.path.isdir(os.path.join(entry.path, "workflows")):
+                        hits[".github/workflows"].append(dirpath)
+                    _walk(entry.path)
+
+        _walk(root_dir)
+
+        # Apply hits in marker order so ties keep the earlier marker
+        for marker_file, info in _MARKERS.items():
+            new_rank = _RANK[info["type"]]
+            for dirpath in hits[marker_file]:
+                project_dir = Path(dirpath)
+                # Use absolute path to get folder name if the project is the workspace root
+                project_name = project_dir.resolve().name
                 if project_name == "": project_name = "root-project"
                 
-                # Update discovered info (don't overwrite if already typed as specific app)
-                if project_name not in discovered or discovered[project_name]["type"] == "service":
+                # Update discovered info (only a more specific project type overwrites)
+                existing = discovered.get(project_name)
+                if existing is None or _RANK[existing["type"]] < new_rank:
                     discovered[project_name] = {
                         "type": info["type"],
-                        "path": str(p.parent),
+                        "path": str(project_dir),
                         "hint": info["hint"],
                         "repo": f"auto/{project_name}"
                     }
@@ -138,6 +263,16 @@ class ConfigLoader:
     @staticmethod
     def generate_default_config(path: str = "readiness_schema.json", discovered_projects: dict = None):
         """Utility to generate a starter config file."""
+        if discovered_projects:
+            ConfigLoader._write_config(ConfigLoader._build_default_config(discovered_projects), path)
+        else:
+            Path(path).write_bytes(_DEFAULT_CONFIG_BYTES)
+            ConfigLoader.invalidate()
+        print(f"Generated default config at {path}")
+
+    @staticmethod
+    def _build_default_config(discovered_projects: dict = None) -> dict:
+        """Builds the starter config in memory, with one staging environment per discovered project."""
         projects = {}
         if discovered_projects:
             for name, data in discovered_projects.items():
@@ -160,28 +295,13 @@ class ConfigLoader:
                     }
                 }
 
-        default_config = {
-            "project_name": "Enterprise Readiness Hub",
-            "projects": projects or {
-                "frontend": {
-                    "repo": "owner/frontend-react-app",
-                    "environments": {
-                        "staging": {
-                            "health_url": "http://localhost:8080/frontend/health",
-                            "db_url": "none",
-                            "config_template": "frontend-react-app/config/staging.json"
-                        }
-                    }
-                }
-            },
-            "mandatory_env_vars": [
-                "COHERE_API_KEY",
-                "GITHUB_TOKEN"
-            ],
-            "timeouts": {
-                "health_check_seconds": 10
-            }
-        }
-        with open(path, "w", encoding="utf-8") as f:
-            json.dump(default_config, f, indent=2)
-        print(f"Generated default config at {path}")
+        default_config = copy.deepcopy(_DEFAULT_CONFIG_TEMPLATE)
+        if projects:
+            default_config["projects"] = projects
+        return default_config
+
+    @staticmethod
+    def _write_config(config: dict, path: str = "readiness_schema.json"):
+        """Serializes a config to disk and drops cached reads of the old file."""
+        Path(path).write_bytes(_dumps_config(config))
+        ConfigLoader.invalidate()
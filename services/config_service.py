@@ -1,17 +1,94 @@
+import functools
 import os
+import re
+import time
 import json
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 from pathlib import Path
 
 logger = logging.getLogger("config_service")
 
+# Fastest available JSON parser; orjson and ujson are optional accelerators
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    try:
+        import ujson
+        _loads = ujson.loads
+    except ImportError:
+        _loads = json.loads
+
+# Numeric shapes accepted by _parse_value; matching first avoids raising ValueError for plain strings
+_INT_RE = re.compile(r'[+-]?\d+')
+_FLOAT_RE = re.compile(r'[+-]?(?:\d+\.\d*|\.\d+|\d+)(?:[eE][+-]?\d+)?')
+
+@functools.lru_cache(maxsize=1024)
+def _parse_scalar(value: str) -> Any:
+    """bool/int/float/str classification for env values; results are immutable, so memoized."""
+    # Try boolean
+    lowered = value.lower()
+    if lowered in ('true', 'yes', '1'):
+        return True
+    if lowered in ('false', 'no', '0'):
+        return False
+    
+    # Try int
+    if _INT_RE.fullmatch(value):
+        return int(value)
+    
+    # Try float
+    if _FLOAT_RE.fullmatch(value):
+        return float(value)
+    
+    # Return as string
+    return value
+
+# Optional/heavy modules, imported on first use and remembered (False = not installed)
+_yaml = None
+_hvac = None
+_boto3 = None
+
+def _get_yaml():
+    global _yaml
+    if _yaml is None:
+        try:
+            import yaml
+            _yaml = yaml
+        except ImportError:
+            _yaml = False
+    return _yaml or None
+
+def _get_hvac():
+    global _hvac
+    if _hvac is None:
+        try:
+            import hvac
+            _hvac = hvac
+        except ImportError:
+            _hvac = False
+    return _hvac or None
+
+def _get_boto3():
+    global _boto3
+    if _boto3 is None:
+        try:
+            import boto3
+            _boto3 = boto3
+        except ImportError:
+            _boto3 = False
+    return _boto3 or None
+
 class ConfigService:
     """
     Centralized configuration service that fetches environment configs from various sources.
     Supports: Environment Variables, JSON files, and extensible for Vault/AWS Secrets Manager.
     """
     
+    # How long a remote source that has no config for an environment (not found) is skipped for it
+    NEGATIVE_CACHE_TTL_SECONDS = 30.0
+    
     def __init__(self, config_dir: str = None):
         """
         Initialize the config service.
@@ -20,7 +97,17 @@ class ConfigService:
             config_dir: Directory containing environment config files (optional)
         """
         self.config_dir = config_dir or os.getenv("CONFIG_DIR", "./config")
+        # Parsed config files: path -> ((st_mtime_ns, st_size), data)
         self.cache = {}
+        # Sources tried in order: (description, fetch function, remember misses).
+        # Subclasses prepend their remote stores.
+        self._strategies = [
+            ("environment variables", self._fetch_from_env_vars, False),
+            ("JSON file", self._fetch_from_json_file, False),
+            ("YAML file", self._fetch_from_yaml_file, False),
+        ]
+        # (source, environment) -> monotonic time the remote source last reported "not found"
+        self._negative_sources = {}
         
     def fetch_environment_config(self, environment: str) -> Dict[str, Any]:
         """
@@ -42,23 +129,31 @@ class ConfigService:
         """
         logger.info(f"Fetching configuration for environment: {environment}")
         
-        # Try environment variables first
-        env_config = self._fetch_from_env_vars(environment)
-        if env_config:
-            logger.info(f"Loaded {len(env_config)} config values from environment variables")
-            return env_config
-        
-        # Try JSON file
-        json_config = self._fetch_from_json_file(environment)
-        if json_config:
-            logger.info(f"Loaded {len(json_config)} config values from JSON file")
-            return json_config
-        
-        # Try YAML file
-        yaml_config = self._fetch_from_yaml_file(environment)
-        if yaml_config:
-            logger.info(f"Loaded {len(yaml_config)} config values from YAML file")
-            return yaml_config
+        now = time.monotonic()
+        for source, fetch, remember_misses in self._strategies:
+            if remember_misses:
+                missed_at = self._negative_sources.get((source, environment))
+                if missed_at is not None and now - missed_at < self.NEGATIVE_CACHE_TTL_SECONDS:
+                    logger.warning(
+                        f"Skipping {source} for '{environment}': it had no config "
+                        f"{now - missed_at:.0f}s ago (rechecked after {self.NEGATIVE_CACHE_TTL_SECONDS:.0f}s)"
+                    )
+                    continue
+                try:
+                    config = fetch(environment)
+                except Exception as e:
+                    # Transient remote failure: fall back for this call only, retry the source next time
+                    logger.warning(f"Failed to fetch from {source}, falling back: {e}")
+                    continue
+                # Only a definite "not found" (None) is remembered; an empty read is retried next time
+                if config is None:
+                    self._negative_sources[(source, environment)] = now
+            else:
+                config = fetch(environment)
+            
+            if config:
+                logger.info(f"Loaded {len(config)} config values from {source}")
+                return config
         
         # No config found
         logger.error(f"No configuration found for environment: {environment}")
@@ -76,35 +171,56 @@ class ConfigService:
         Looks for variables prefixed with {ENVIRONMENT}_ (e.g., PRODUCTION_DB_URL)
         """
         prefix = f"{environment.upper()}_"
-        config = {}
+        prefix_len = len(prefix)
         
-        for key, value in os.environ.items():
-            if key.startswith(prefix):
-                # Remove prefix and store
-                config_key = key[len(prefix):]
-                config[config_key] = self._parse_value(value)
+        # Scanned and parsed on every call, so rotated, added and removed variables are always seen.
+        # Scalars come from the memoized _parse_scalar; JSON values are parsed fresh per call,
+        # so no caller can mutate another caller's lists/dicts.
+        config = {
+            # Remove prefix and store
+            key[prefix_len:]: self._parse_value(value)
+            for key, value in os.environ.items()
+            if key.startswith(prefix)
+        }
         
-        return config if config else None
+        return config or None
+    
+    def _read_cached(self, file_path: Path, parse) -> Optional[Dict[str, Any]]:
+        """
+        Returns the parsed contents of file_path, re-parsing only when its mtime or size changed.
+        Returns None if the file does not exist.
+        """
+        try:
+            st = file_path.stat()
+        except OSError:
+            return None
+        
+        key = str(file_path)
+        signature = (st.st_mtime_ns, st.st_size)
+        cached = self.cache.get(key)
+        if cached is not None and cached[0] == signature:
+            data = cached[1]
+        else:
+            # Parsers get raw bytes: JSON and YAML both detect/decode UTF-8 themselves
+            data = parse(file_path.read_bytes())
+            self.cache[key] = (signature, data)
+        # Shallow copy so callers can't alter the cached mapping
+        return dict(data) if isinstance(data, dict) else data
     
     def _fetch_from_json_file(self, environment: str) -> Optional[Dict[str, Any]]:
         """Fetch config from JSON file."""
         file_path = Path(self.config_dir) / f"{environment}.json"
         
-        if not file_path.exists():
-            return None
-        
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            return self._read_cached(file_path, _loads)
         except Exception as e:
             logger.warning(f"Failed to load JSON config from {file_path}: {e}")
             return None
     
     def _fetch_from_yaml_file(self, environment: str) -> Optional[Dict[str, Any]]:
         """Fetch config from YAML file."""
-        try:
-            import yaml
-        except ImportError:
+        yaml = _get_yaml()
+        if yaml is None:
             logger.debug("PyYAML not installed, skipping YAML config loading")
             return None
         
@@ -116,9 +232,10 @@ class ConfigService:
             if not file_path.exists():
                 return None
         
+        # libyaml-backed loader when PyYAML was built with it
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return yaml.safe_load(f)
+            return self._read_cached(file_path, lambda data: yaml.load(data, Loader=loader))
         except Exception as e:
             logger.warning(f"Failed to load YAML config from {file_path}: {e}")
             return None
@@ -128,33 +245,15 @@ class ConfigService:
         Parse string value to appropriate type.
         Handles: int, float, bool, JSON objects/arrays
         """
-        # Try boolean
-        if value.lower() in ('true', 'yes', '1'):
-            return True
-        if value.lower() in ('false', 'no', '0'):
-            return False
-        
-        # Try int
-        try:
-            return int(value)
-        except ValueError:
-            pass
-        
-        # Try float
-        try:
-            return float(value)
-        except ValueError:
-            pass
-        
-        # Try JSON (for objects/arrays)
+        # Try JSON (for objects/arrays). Checked first: such values are never bool/int/float,
+        # and the parsed result is mutable so it must not come from the shared cache.
         if value.startswith(('{', '[')):
             try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                pass
+                return _loads(value)
+            except (ValueError, TypeError):
+                return value
         
-        # Return as string
-        return value
+        return _parse_scalar(value)
     
     def get_config_value(self, environment: str, key: str, default: Any = None) -> Any:
         """
@@ -213,42 +312,37 @@ class VaultConfigService(ConfigService):
         self.vault_client = None
         
         if self.vault_url and self.vault_token:
-            try:
-                import hvac
-                self.vault_client = hvac.Client(url=self.vault_url, token=self.vault_token)
-                logger.info("Vault client initialized successfully")
-            except ImportError:
+            hvac = _get_hvac()
+            if hvac is None:
                 logger.warning("hvac library not installed. Vault support disabled.")
-            except Exception as e:
-                logger.warning(f"Failed to initialize Vault client: {e}")
-    
-    def fetch_environment_config(self, environment: str) -> Dict[str, Any]:
-        """Fetch config from Vault first, then fall back to parent implementation."""
-        if self.vault_client:
-            vault_config = self._fetch_from_vault(environment)
-            if vault_config:
-                logger.info(f"Loaded {len(vault_config)} config values from Vault")
-                return vault_config
+            else:
+                try:
+                    self.vault_client = hvac.Client(url=self.vault_url, token=self.vault_token)
+                    logger.info("Vault client initialized successfully")
+                except Exception as e:
+                    logger.warning(f"Failed to initialize Vault client: {e}")
         
-        # Fall back to standard sources
-        return super().fetch_environment_config(environment)
+        # Vault first, then fall back to the standard sources
+        if self.vault_client:
+            self._strategies.insert(0, ("Vault", self._fetch_from_vault, True))
     
     def _fetch_from_vault(self, environment: str) -> Optional[Dict[str, Any]]:
-        """Fetch config from HashiCorp Vault."""
+        """
+        Fetch config from HashiCorp Vault.
+        Returns None when no secret exists for the environment; other errors propagate.
+        """
         if not self.vault_client:
             return None
         
         try:
             # Read from secret/data/{environment} path (KV v2)
-            secret_path = f"secret/data/{environment}"
             response = self.vault_client.secrets.kv.v2.read_secret_version(
                 path=environment,
                 mount_point='secret'
             )
-            return response['data']['data']
-        except Exception as e:
-            logger.warning(f"Failed to fetch from Vault: {e}")
+        except _get_hvac().exceptions.InvalidPath:
             return None
+        return response['data']['data']
 
 
 class AWSSecretsManagerConfigService(ConfigService):
@@ -261,43 +355,53 @@ class AWSSecretsManagerConfigService(ConfigService):
         super().__init__(**kwargs)
         self.region_name = region_name or os.getenv("AWS_REGION", "us-east-1")
         self.secrets_client = None
+        # secret name -> (VersionId, parsed payload); secrets rarely change between polls
+        self._secret_versions: Dict[str, Tuple[str, Dict[str, Any]]] = {}
         
-        try:
-            import boto3
-            self.secrets_client = boto3.client('secretsmanager', region_name=self.region_name)
-            logger.info("AWS Secrets Manager client initialized successfully")
-        except ImportError:
+        boto3 = _get_boto3()
+        if boto3 is None:
             logger.warning("boto3 library not installed. AWS Secrets Manager support disabled.")
-        except Exception as e:
-            logger.warning(f"Failed to initialize AWS Secrets Manager client: {e}")
-    
-    def fetch_environment_config(self, environment: str) -> Dict[str, Any]:
-        """Fetch config from AWS Secrets Manager first, then fall back to parent implementation."""
+        else:
+            try:
+                self.secrets_client = boto3.client('secretsmanager', region_name=self.region_name)
+                logger.info("AWS Secrets Manager client initialized successfully")
+            except Exception as e:
+                logger.warning(f"Failed to initialize AWS Secrets Manager client: {e}")
+        
+        # AWS Secrets Manager first, then fall back to the standard sources
         if self.secrets_client:
-            aws_config = self._fetch_from_aws_secrets(environment)
-            if aws_config:
-                logger.info(f"Loaded {len(aws_config)} config values from AWS Secrets Manager")
-                return aws_config
+            self._strategies.insert(0, ("AWS Secrets Manager", self._fetch_from_aws_secrets, True))
+    
+    def _parse_secret(self, secret: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Parses a secret value response, reusing the cached payload when VersionId is unchanged."""
+        secret_name = secret.get('Name', '')
+        version = secret.get('VersionId')
+        cached = self._secret_versions.get(secret_name)
+        if version and cached and cached[0] == version:
+            return dict(cached[1])
         
-        # Fall back to standard sources
-        return super().fetch_environment_config(environment)
+        # Parse the secret string (should be JSON)
+        if 'SecretString' not in secret:
+            logger.warning(f"Secret {secret_name} is binary, expected JSON string")
+            return None
+        data = _loads(secret['SecretString'])
+        if version:
+            self._secret_versions[secret_name] = (version, data)
+        return dict(data)
     
     def _fetch_from_aws_secrets(self, environment: str) -> Optional[Dict[str, Any]]:
-        """Fetch config from AWS Secrets Manager."""
+        """
+        Fetch config from AWS Secrets Manager.
+        Returns None when no secret exists for the environment; other errors propagate.
+        """
         if not self.secrets_client:
             return None
         
+        # Secret name format: {environment}/config
+        secret_name = f"{environment}/config"
         try:
-            # Secret name format: {environment}/config
-            secret_name = f"{environment}/config"
             response = self.secrets_client.get_secret_value(SecretId=secret_name)
-            
-            # Parse the secret string (should be JSON)
-            if 'SecretString' in response:
-                return json.loads(response['SecretString'])
-            else:
-                logger.warning(f"Secret {secret_name} is binary, expected JSON string")
-                return None
-        except Exception as e:
-            logger.warning(f"Failed to fetch from AWS Secrets Manager: {e}")
+        except self.secrets_client.exceptions.ResourceNotFoundException:
             return None
+        response.setdefault('Name', secret_name)
+        return self._parse_secret(response)
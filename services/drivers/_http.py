@@ -0,0 +1,58 @@
+"""
+Process-wide pooled httpx client shared by the agent and the async drivers.
+Keep-alive connections (and TLS sessions) are reused across tools and probes instead of
+each caller building its own pool; httpx itself is only imported on first use.
+"""
+import logging
+
+logger = logging.getLogger("http_client")
+
+# Pool sizing for the shared client
+MAX_CONNECTIONS = 200
+MAX_KEEPALIVE_CONNECTIONS = 100
+
+_client = None
+_ssl_context = None
+
+def _get_ssl_context():
+    """One CA-loaded SSLContext per process, so recreated clients keep its TLS session cache."""
+    global _ssl_context
+    if _ssl_context is None:
+        import httpx
+        _ssl_context = httpx.create_ssl_context()
+    return _ssl_context
+
+def get_shared_client():
+    """Returns the shared AsyncClient, creating it on first use (or after it was closed)."""
+    # Creation has no await point, so concurrent first callers on the loop cannot race on it
+    global _client
+    if _client is None or _client.is_closed:
+        import httpx
+        try:
+            import h2  # noqa: F401 - optional, enables HTTP/2 multiplexing
+            http2 = True
+        except ImportError:
+            http2 = False
+        # httpcore advertises ALPN (h2, http/1.1) on the context itself based on http2.
+        # No transport-level retries: callers own their retry policy (e.g. jittered health probes)
+        transport = httpx.AsyncHTTPTransport(
+            verify=_get_ssl_context(),
+            http2=http2,
+            limits=httpx.Limits(
+                max_keepalive_connections=MAX_KEEPALIVE_CONNECTIONS,
+                max_connections=MAX_CONNECTIONS,
+                keepalive_expiry=60
+            )
+        )
+        _client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(10.0, connect=5.0)
+        )
+    return _client
+
+async def aclose_shared_client():
+    """Closes the shared client; call once on shutdown."""
+    global _client
+    client, _client = _client, None
+    if client is not None:
+        await client.aclose()
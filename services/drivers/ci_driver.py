@@ -1,26 +1,56 @@
 import os
+import copy
+import io
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import shutil
+import tempfile
 import zipfile
-import io
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from services.env_loader import FlexibleEnvLoader
 
 logger = logging.getLogger("ci_driver")
 
+def _make_session() -> requests.Session:
+    """Keep-alive session with a small connection pool and retries on transient HTTP errors."""
+    session = requests.Session()
+    retries = Retry(
+        total=3,
+        backoff_factor=0.5,
+        status_forcelist=[429, 500, 502, 503, 504],
+        raise_on_status=False  # hand the final response back so callers report the status code
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=10, max_retries=retries)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
 class GitHubActionsDriver:
     """
     Driver for fetching build logs from GitHub Actions.
     Automatically detects GitHub token from various environment variable names.
     """
+    # Log bundles up to this (declared) size stay in memory; larger or unsized ones go to a temp file
+    LOG_SPOOL_MAX_MEMORY = 16 * 1024 * 1024
+
     def __init__(self, token: str = None):
         # Use flexible env loader to support multiple token variable names
         self.token = token or FlexibleEnvLoader.get_github_token()
         self.base_url = os.getenv("GITHUB_API_URL", "https://api.github.com")
+        self.session = _make_session()
+        self.session.headers.update({"Accept": "application/vnd.github.v3+json"})
+        if self.token:
+            self.session.headers["Authorization"] = f"token {self.token}"
+        # (repo, workflow_name, status, branch, limit) -> (ETag, formatted runs) for conditional GETs
+        self._etag_cache = {}
 
-    def fetch_log(self, repo: str, run_id: str) -> str:
+    def fetch_log(self, repo: str, run_id: str, max_chars: int = None) -> str:
         """
         Fetches the log for a specific workflow run.
         Note: GitHub returns logs as a zip file containing multiple job logs.
+        If max_chars is set, members are decompressed only until that budget is spent.
         """
         if not self.token:
             logger.error("GITHUB_TOKEN not configured. Cannot fetch build logs.")
@@ -29,33 +59,83 @@ class GitHubActionsDriver:
                 "Please set GITHUB_TOKEN, GH_TOKEN, or GITHUB_PAT environment variable."
             )
 
-        headers = {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github.v3+json",
-        }
-        
-        # Download logs zip
+        # Download logs zip, streamed into a buffer (memory when small, else a temp file)
+        # instead of buffering the whole body and copying it again into BytesIO.
+        # Zips don't compress further, so ask for the raw bytes.
         url = f"{self.base_url}/repos/{repo}/actions/runs/{run_id}/logs"
-        response = requests.get(url, headers=headers)
-        
-        if response.status_code != 200:
-            raise RuntimeError(f"Failed to fetch GitHub logs: {response.status_code} {response.text}")
-
-        # Debug: check if it's actually a zip
-        if not response.content.startswith(b'PK'):
-            logger.error(f"Response is not a zip! Content starts with: {response.content[:100]}")
-            raise RuntimeError("File is not a zip file")
-
-        # Unzip in memory and extract logs
-        with zipfile.ZipFile(io.BytesIO(response.content)) as z:
-            # Join all log files into one text block for the LLM
-            log_contents = []
-            for filename in z.namelist():
-                if filename.endswith(".txt") or ".log" in filename:
-                    with z.open(filename) as f:
-                        log_contents.append(f"--- File: {filename} ---\n{f.read().decode('utf-8')}")
+        with self.session.get(url, headers={"Accept-Encoding": "identity"}, stream=True) as response:
+            if response.status_code != 200:
+                raise RuntimeError(f"Failed to fetch GitHub logs: {response.status_code} {response.text}")
+
+            response.raw.decode_content = True
+
+            # Debug: check if it's actually a zip, from the first bytes only
+            head = response.raw.read(4)
+            if not head.startswith(b'PK'):
+                logger.error(f"Response is not a zip! Content starts with: {head + response.raw.read(96)}")
+                raise RuntimeError("File is not a zip file")
+
+            # Not SpooledTemporaryFile: it is only seekable() (as ZipFile requires) on Python 3.11+
+            size = response.headers.get("Content-Length")
+            in_memory = size is not None and size.isdigit() and int(size) <= self.LOG_SPOOL_MAX_MEMORY
+            with (io.BytesIO() if in_memory else tempfile.TemporaryFile()) as spool:
+                spool.write(head)
+                shutil.copyfileobj(response.raw, spool, 1 << 20)
+                spool.seek(0)
+
+                return self._extract_logs(spool, max_chars)
+
+    @staticmethod
+    def _extract_logs(zip_file, max_chars: int = None) -> str:
+        """Joins the .txt/.log members of a GitHub logs bundle into one text block."""
+        with zipfile.ZipFile(zip_file) as z:
+            filenames = [fn for fn in z.namelist() if fn.endswith(".txt") or ".log" in fn]
+
+            # Join all log files into one text block for the LLM, writing each member
+            # straight into one buffer instead of building per-file strings first
+            buf = io.StringIO()
+
+            def append(filename, text):
+                if buf.tell():
+                    buf.write("\n\n")
+                buf.write(f"--- File: {filename} ---\n")
+                buf.write(text)
+
+            if max_chars is None:
+                # Members are independent and zlib releases the GIL while inflating,
+                # so decompress them in parallel; map() keeps the bundle order.
+                def read_member(filename):
+                    return z.read(filename).decode('utf-8', errors='replace')
+
+                if len(filenames) > 1:
+                    workers = min(len(filenames), os.cpu_count() or 1, 32)
+                    with ThreadPoolExecutor(max_workers=workers) as ex:
+                        for filename, text in zip(filenames, ex.map(read_member, filenames)):
+                            append(filename, text)
+                else:
+                    for filename in filenames:
+                        append(filename, read_member(filename))
+            else:
+                # Budget in characters of the joined text (separators and headers included),
+                # so the result is a prefix-exact stand-in for the full text cut at max_chars
+                remaining = max_chars
+                for filename in filenames:
+                    start = buf.tell()
+                    append(filename, "")
+                    remaining -= buf.tell() - start
+                    if remaining <= 0:
+                        break
+                    # Decode incrementally and stop inflating the member once the budget is covered;
+                    # newline='' keeps line endings as-is, like the full path's bytes.decode()
+                    with z.open(filename) as f, \
+                            io.TextIOWrapper(f, 'utf-8', errors='replace', newline='') as reader:
+                        text = reader.read(remaining)
+                    buf.write(text)
+                    remaining -= len(text)
+                    if remaining <= 0:
+                        break
             
-            return "\n\n".join(log_contents) if log_contents else "No log files found in bundle."
+            return buf.getvalue() if filenames else "No log files found in bundle."
 
     def list_workflow_runs(self, repo: str, workflow_name: str = None, 
                            status: str = None, branch: str = None, limit: int = 10) -> list:
@@ -76,11 +156,6 @@ class GitHubActionsDriver:
             logger.warning("GITHUB_TOKEN not found, returning empty list.")
             return []
 
-        headers = {
-            "Authorization": f"token {self.token}",
-            "Accept": "application/vnd.github.v3+json",
-        }
-        
         # Build query parameters
         params = {"per_page": min(limit, 100)}
         if status:
@@ -91,7 +166,15 @@ class GitHubActionsDriver:
         # If workflow_name is provided, we need to get workflow_id first
         url = f"{self.base_url}/repos/{repo}/actions/runs"
         
-        response = requests.get(url, headers=headers, params=params)
+        # Conditional GET: an unchanged list comes back as a body-less 304
+        # that GitHub does not count against the rate limit
+        cache_key = (repo, workflow_name, status, branch, limit)
+        cached = self._etag_cache.get(cache_key)
+        headers = {"If-None-Match": cached[0]} if cached else None
+        response = self.session.get(url, params=params, headers=headers)
+        
+        if response.status_code == 304 and cached:
+            return copy.deepcopy(cached[1])
         
         if response.status_code != 200:
             logger.error(f"Failed to list workflow runs: {response.status_code} {response.text}")
@@ -106,7 +189,7 @@ class GitHubActionsDriver:
                     workflow_name in r.get("path", "")]
         
         # Format the response
-        return [{
+        formatted = [{
             "id": run["id"],
             "name": run.get("name", "Unknown"),
             "status": run.get("status", "unknown"),
@@ -120,6 +203,11 @@ class GitHubActionsDriver:
             },
             "html_url": run.get("html_url")
         } for run in runs[:limit]]
+        
+        etag = response.headers.get("ETag")
+        if etag:
+            self._etag_cache[cache_key] = (etag, copy.deepcopy(formatted))
+        return formatted
 
     def get_latest_run(self, repo: str, workflow_name: str = None, 
                        branch: str = None, status: str = "completed") -> dict:
@@ -149,10 +237,13 @@ class JenkinsDriver:
     """
     Driver for fetching build logs from Jenkins.
     """
+    def __init__(self):
+        self.session = _make_session()
+
     def fetch_log(self, build_url: str) -> str:
         # Appending /consoleText is the standard way to get raw logs from Jenkins
         url = f"{build_url.rstrip('/')}/consoleText"
-        response = requests.get(url)
+        response = self.session.get(url)
         if response.status_code != 200:
              raise RuntimeError(f"Failed to fetch Jenkins logs: {response.status_code}")
         return response.text
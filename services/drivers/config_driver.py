@@ -1,23 +1,104 @@
+import functools
+import io
+from collections import deque
 import os
+import re
 import json
-import yaml
 import logging
 from typing import Dict, Any, List
 
 logger = logging.getLogger("config_driver")
 
+# orjson parses bytes directly when installed
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# KEY=VALUE lines (comments/blank lines never match); keys may contain dots for .properties reuse.
+# The value is captured as "double", 'single' or bare text, minus a trailing " # comment".
+_DOTENV_RE = re.compile(
+    r'^[ \t]*([^#\s=][^=\r\n]*?)[ \t]*=[ \t]*'
+    r'(?:"((?:[^"\\\r\n]|\\.)*)"|\'((?:[^\'\\\r\n]|\\.)*)\'|(.*?))'
+    r'(?:[ \t]+#.*?)?[ \t]*\r?$',
+    re.M
+)
+# .properties lines: no inline comments, so a '#' after the '=' stays part of the value
+_PROPERTIES_RE = re.compile(r'^[ \t]*([^#\s=][^=\r\n]*?)[ \t]*=[ \t]*(.*?)[ \t]*\r?$', re.M)
+# ENV instructions: legacy "ENV KEY value with spaces" (groups 1-2) or "ENV K1=v1 K2="v 2"" (group 3)
+_DOCKER_ENV_RE = re.compile(r'^[ \t]*ENV[ \t]+(?:([^\s=]+)[ \t]+([^\r\n]*?)|([^\r\n]*?))[ \t]*\r?$', re.M | re.I)
+# KEY=VALUE pairs within one ENV instruction; values may be quoted
+_DOCKER_KV_RE = re.compile(r'([^\s=]+)=("[^"]*"|\'[^\']*\'|\S*)')
+
+def _unquote(value: str) -> str:
+    """Drops one pair of matching surrounding quotes with a single slice."""
+    if len(value) >= 2 and value[0] == value[-1] and value[0] in ('"', "'"):
+        return value[1:-1]
+    return value
+
+# Sibling dotenv files tried, in order, when a requested .env-style baseline does not exist
+_DOTENV_FALLBACKS = (".env", ".env.local", ".env.example", ".env.production")
+
+_ET = None
+_yaml_load = None
+_ijson = None
+
+# Baselines above this size are parsed straight from the file instead of from an in-memory copy
+_STREAM_PARSE_THRESHOLD = 1 << 20
+
+def _get_yaml_load():
+    """yaml.load bound to libyaml's CSafeLoader when available; PyYAML is imported on first YAML baseline."""
+    global _yaml_load
+    if _yaml_load is None:
+        import yaml
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        _yaml_load = functools.partial(yaml.load, Loader=loader)
+    return _yaml_load
+
+def _get_ijson():
+    """Optional ijson (incremental JSON parser), imported on first large JSON baseline (False = not installed)."""
+    global _ijson
+    if _ijson is None:
+        try:
+            import ijson
+            _ijson = ijson
+        except ImportError:
+            _ijson = False
+    return _ijson or None
+
+def _get_ET():
+    """lxml.etree when installed, else xml.etree.ElementTree; imported on first pom.xml parse."""
+    global _ET
+    if _ET is None:
+        try:
+            from lxml import etree as ET
+        except ImportError:
+            import xml.etree.ElementTree as ET
+        _ET = ET
+    return _ET
+
+# Whole-value placeholders (case-insensitive) and substrings that mark a placeholder anywhere.
+_EXACT_PLACEHOLDERS = frozenset({"NONE", "NULL", "TODO", "CHANGE_ME", "PLACEHOLDER", "YOUR_KEY_HERE"})
+_PARTIAL_PLACEHOLDERS = ("YOUR_KEY_HERE", "INSERT_SECRET")
+# Possible first characters of an exact placeholder, either case
+_PLACEHOLDER_FIRST = frozenset(c for p in _EXACT_PLACEHOLDERS for c in (p[0], p[0].lower()))
+
 class DriftAnalyst:
     """
     Analyzes drift between configuration templates and actual environment files.
     Purely deterministic: gathers technical facts (missing keys, value issues).
     """
+    _PLACEHOLDER_RE = re.compile('|'.join(sorted(_EXACT_PLACEHOLDERS)), re.IGNORECASE)
+    _PATTERN_RE = re.compile('|'.join(_PARTIAL_PLACEHOLDERS), re.IGNORECASE)
+
     def compare_configs(self, template_path: str, actual_data: Dict[str, Any], integrity_mode: bool = False) -> dict:
         issues = []
         analysis_type = "INTEGRITY" if integrity_mode else "DRIFT"
         
-        # 1. Fuzzy Resolution
-        resolved_path = self._resolve_fuzzy_path(template_path)
-        if not os.path.exists(resolved_path):
+        # 1. Fuzzy Resolution (the stat doubles as the existence check and the cache key)
+        resolved_path, st = self._resolve_fuzzy_path(template_path)
+        if st is None:
              # We treat file missing as a high-priority drift issue for the AI to narrate
              return {
                 "drift_detected": True,
@@ -26,19 +107,9 @@ class DriftAnalyst:
                 "analysis_type": analysis_type
              }
 
-        # 2. Load and Parse baseline
-        template = {}
+        # 2. Load and Parse baseline (cached until the file changes)
         try:
-            with open(resolved_path, 'r', encoding='utf-8') as f:
-                content = f.read()
-                ext = os.path.splitext(resolved_path)[1].lower()
-                if ext in ['.yaml', '.yml']: template = yaml.safe_load(content)
-                elif ext == '.json': template = json.loads(content)
-                elif '.env' in resolved_path or resolved_path.endswith('.local'): template = self._parse_dotenv(content)
-                elif ext == '.properties': template = self._parse_properties(content)
-                elif resolved_path.endswith('pom.xml'): template = self._parse_pom_xml(content)
-                elif 'Dockerfile' in resolved_path: template = self._parse_dockerfile(content)
-                else: template = self._parse_dotenv(content) if '=' in content else json.loads(content)
+            template = self._load_template(resolved_path, st.st_mtime_ns, st.st_size)
         except Exception as e:
             return {
                 "drift_detected": True,
@@ -63,120 +134,229 @@ class DriftAnalyst:
 
         return {
             "drift_detected": len(issues) > 0,
-            "drift_keys": list(set(issues)),
+            # Order-preserving dedupe (dotted keys like "a.b" can collide with nested a -> b)
+            "drift_keys": list(dict.fromkeys(issues)),
             "resolved_path": resolved_path,
             "analysis_type": analysis_type
         }
 
-    def _resolve_fuzzy_path(self, path: str) -> str:
-        if os.path.exists(path): return path
+    @classmethod
+    @functools.lru_cache(maxsize=64)
+    def _load_template(cls, resolved_path: str, mtime_ns: int, size: int):
+        """
+        Parses a baseline file, dispatching on its name/extension.
+        mtime_ns and size are part of the cache key so edits to the file trigger a re-parse.
+        Cached per class, so every analyst instance shares it; the result must not be mutated.
+        """
+        ext = os.path.splitext(resolved_path)[1].lower()
+        if size > _STREAM_PARSE_THRESHOLD and ext in ('.json', '.yaml', '.yml'):
+            # Large baselines: never hold the raw bytes and the parsed tree at the same time
+            if ext != '.json':
+                with open(resolved_path, 'rb') as f:
+                    return _get_yaml_load()(f)
+            ijson = _get_ijson()
+            if ijson is not None:
+                with open(resolved_path, 'rb') as f:
+                    return next(ijson.items(f, '', use_float=True))
+        raw = cls._read_bytes(resolved_path, size)
+        # YAML, JSON and XML parsers take bytes directly; only the line-based formats need a str
+        if ext in ['.yaml', '.yml']: return _get_yaml_load()(raw)
+        elif ext == '.json': return _json_loads(raw)
+        elif resolved_path.endswith('pom.xml'): return cls._parse_pom_xml(raw)
+        content = raw.decode('utf-8')
+        if '.env' in resolved_path or resolved_path.endswith('.local'): return cls._parse_dotenv(content)
+        elif ext == '.properties': return cls._parse_properties(content)
+        elif 'Dockerfile' in resolved_path: return cls._parse_dockerfile(content)
+        else: return cls._parse_dotenv(content) if '=' in content else _json_loads(content)
+
+    @staticmethod
+    def _read_bytes(path: str, size: int) -> bytes:
+        """Reads a whole file with raw os.read calls, bypassing the buffered text io stack."""
+        fd = os.open(path, os.O_RDONLY)
+        try:
+            chunks = []
+            remaining = size
+            # size comes from the earlier stat; keep reading to EOF in case the file grew since
+            while True:
+                chunk = os.read(fd, max(remaining, 65536))
+                if not chunk:
+                    break
+                chunks.append(chunk)
+                remaining -= len(chunk)
+            return b"".join(chunks)
+        finally:
+            os.close(fd)
+
+    def _resolve_fuzzy_path(self, path: str):
+        """Returns (resolved_path, stat_result); stat_result is None when no candidate exists."""
+        try:
+            return path, os.stat(path)
+        except OSError:
+            pass
         if ".env" in path or path.endswith(".local") or path.endswith(".example"):
             base_dir = os.path.dirname(path) or "."
-            for var in [".env", ".env.local", ".env.example", ".env.production"]:
-                check_path = os.path.join(base_dir, var)
-                if os.path.exists(check_path): return check_path
-        return path
+            # One directory listing instead of a stat per sibling candidate
+            try:
+                with os.scandir(base_dir) as entries:
+                    found = {e.name: e for e in entries if e.name in _DOTENV_FALLBACKS}
+            except OSError:
+                found = {}
+            for name in _DOTENV_FALLBACKS:  # preference order
+                entry = found.get(name)
+                if entry is not None and entry.is_file():
+                    return entry.path, entry.stat()
+        return path, None
 
     def _find_value_issues(self, data: dict, prefix: str = "") -> List[str]:
         """Detects empty or 'placeholder' values while avoiding false positives."""
         issues = []
-        # Exact match placeholders (case-insensitive)
-        exact_placeholders = ["NONE", "NULL", "TODO", "CHANGE_ME", "PLACEHOLDER", "YOUR_KEY_HERE"]
         
-        for key, value in data.items():
-            full_key = f"{prefix}{key}"
-            if value is None:
-                issues.append(f"{full_key} (NULL)")
-                continue
-                
-            if isinstance(value, str):
-                v_strip = value.strip()
-                v_upper = v_strip.upper()
-                
-                # 1. Empty check
-                if not v_strip:
-                    issues.append(f"{full_key} (EMPTY)")
-                # 2. Strict placeholder check
-                elif v_upper in exact_placeholders:
-                    issues.append(f"{full_key} ({v_upper})")
-                # 3. Pattern check for common placeholders
-                elif any(p in v_upper for p in ["YOUR_KEY_HERE", "INSERT_SECRET"]):
-                    issues.append(f"{full_key} (PLACEHOLDER)")
-                # Note: We omit "EXAMPLE" from partial matches to avoid flagging "example.com"
-            elif isinstance(value, dict):
-                issues.extend(self._find_value_issues(value, f"{full_key}."))
+        # Breadth-first worklist instead of recursion, so issues come out shallowest-first in
+        # document order; prefixes are only built for nested sections
+        queue = deque([(data, prefix)])
+        while queue:
+            section, section_prefix = queue.popleft()
+            for key, value in section.items():
+                # Key names are only formatted when there is something to report
+                if value is None:
+                    issues.append(f"{section_prefix}{key} (NULL)")
+                    continue
+                    
+                if isinstance(value, str):
+                    v_strip = value.strip()
+                    
+                    # 1. Empty check
+                    if not v_strip:
+                        issues.append(f"{section_prefix}{key} (EMPTY)")
+                        continue
+                    # 2. Strict placeholder check (first-letter test skips the regex for most values)
+                    m = self._PLACEHOLDER_RE.fullmatch(v_strip) if v_strip[0] in _PLACEHOLDER_FIRST else None
+                    if m:
+                        issues.append(f"{section_prefix}{key} ({m.group(0).upper()})")
+                    # 3. Pattern check for common placeholders
+                    elif self._PATTERN_RE.search(v_strip):
+                        issues.append(f"{section_prefix}{key} (PLACEHOLDER)")
+                    # Note: We omit "EXAMPLE" from partial matches to avoid flagging "example.com"
+                elif isinstance(value, dict):
+                    queue.append((value, f"{section_prefix}{key}."))
         return issues
 
-    def _parse_dotenv(self, content: str) -> dict:
+    @staticmethod
+    def _parse_dotenv(content: str) -> dict:
         """Parses KEY=VALUE pairs from a string."""
-        results = {}
-        for line in content.splitlines():
-            line = line.strip()
-            if not line or line.startswith('#'):
-                continue
-            if '=' in line:
-                key, value = line.split('=', 1)
-                results[key.strip()] = value.strip().strip('"').strip("'")
-        return results
+        return {
+            key: double or single or bare
+            for key, double, single, bare in _DOTENV_RE.findall(content)
+        }
 
-    def _parse_properties(self, content: str) -> dict:
+    @staticmethod
+    def _parse_properties(content: str) -> dict:
         """Parses Java-style .properties files."""
-        return self._parse_dotenv(content) # Very similar syntax
+        return {key: _unquote(value) for key, value in _PROPERTIES_RE.findall(content)}
+
+    @staticmethod
+    def _parse_pom_xml(content) -> dict:
+        """Flattened basic properties and dependencies from Maven pom.xml (bytes or str)."""
+        ET = _get_ET()
+        if isinstance(content, str):
+            # lxml rejects str input that carries an encoding declaration; bytes work for both parsers
+            content = content.encode('utf-8')
 
-    def _parse_pom_xml(self, content: str) -> dict:
-        """Flattened basic properties and dependencies from Maven pom.xml."""
-        import xml.etree.ElementTree as ET
+        results = {}
+        ns = None      # "{uri}" of the default namespace, taken from the first start-ns event
+        depth = 0
         try:
-            root = ET.fromstring(content)
-            ns = {'ns': root.tag.split('}')[0].strip('{')} if '}' in root.tag else {}
-            
-            results = {}
-            # Extract basic metadata
-            for child in root:
-                tag = child.tag.split('}')[-1]
-                if tag in ['groupId', 'artifactId', 'version']:
-                    results[tag] = child.text
-            
-            # Extract properties
-            props = root.find('.//ns:properties', ns) if ns else root.find('.//properties')
-            if props is not None:
-                for p in props:
-                    results[f"prop.{p.tag.split('}')[-1]}"] = p.text
-            return results
-        except:
+            # Streamed so each top-level section can be cleared once read
+            for event, item in ET.iterparse(io.BytesIO(content), events=('start-ns', 'start', 'end')):
+                if event == 'start-ns':
+                    if ns is None and not item[0]:
+                        ns = f"{{{item[1]}}}"
+                    continue
+                if event == 'start':
+                    if depth == 0 and ns is None:
+                        ns = ""
+                    depth += 1
+                    continue
+                depth -= 1
+                if depth != 1:
+                    continue  # only direct children of <project> are of interest
+                tag = item.tag
+                if not isinstance(tag, str) or not tag.startswith(ns):
+                    continue
+                tag = tag[len(ns):]
+                # Extract basic metadata
+                if tag in ('groupId', 'artifactId', 'version'):
+                    results[tag] = item.text
+                # Extract properties (only the project-level section, not a <profile>'s)
+                elif tag == 'properties':
+                    for p in item:
+                        if isinstance(p.tag, str):  # lxml keeps comments as children
+                            results[f"prop.{p.tag[len(ns):] if p.tag.startswith(ns) else p.tag}"] = p.text
+                item.clear()
+        except (SyntaxError, ValueError):
+            # ET.ParseError and lxml's XMLSyntaxError both subclass SyntaxError
             return {}
+        return results
 
-    def _parse_dockerfile(self, content: str) -> dict:
+    @staticmethod
+    def _parse_dockerfile(content: str) -> dict:
         """Extracts ENV instructions from Dockerfile."""
         results = {}
-        for line in content.splitlines():
-            line = line.strip()
-            if line.startswith('ENV'):
-                parts = line[3:].strip().split(' ', 1)
-                if len(parts) == 2:
-                    key, val = parts
-                elif '=' in line:
-                    key, val = line[3:].strip().split('=', 1)
-                else:
-                    continue
-                results[key.strip()] = val.strip()
+        for key, value, pairs in _DOCKER_ENV_RE.findall(content):
+            if key:
+                results[key] = _unquote(value)
+            else:
+                for k, v in _DOCKER_KV_RE.findall(pairs):
+                    results[k] = _unquote(v)
         return results
 
     def _find_missing_keys(self, template: dict, actual: dict, prefix: str = "") -> List[str]:
+        # Breadth-first worklist instead of recursion; key names are only formatted
+        # for the missing set and for nested sections
         missing = []
-        for key, value in template.items():
-            full_key = f"{prefix}{key}"
-            if key not in actual:
-                missing.append(full_key)
-            elif isinstance(value, dict) and isinstance(actual.get(key), dict):
-                missing.extend(self._find_missing_keys(value, actual[key], f"{full_key}."))
+        queue = deque([(template, actual, prefix)])
+        while queue:
+            t_section, a_section, section_prefix = queue.popleft()
+            # Single pass in template order (set difference would scramble the report order)
+            for key, value in t_section.items():
+                if key not in a_section:
+                    missing.append(f"{section_prefix}{key}")
+                elif isinstance(value, dict) and isinstance(a_section[key], dict):
+                    queue.append((value, a_section[key], f"{section_prefix}{key}."))
         return missing
 
+@functools.lru_cache(maxsize=128)
+def _compile_rules(keys: tuple):
+    """
+    Compiles "every key present and truthy" into a fastjsonschema validator for a rule set.
+    Returns None when fastjsonschema is not installed.
+    """
+    try:
+        import fastjsonschema
+    except ImportError:
+        return None
+    truthy = {"not": {"enum": [None, "", 0, False, [], {}]}}
+    return fastjsonschema.compile({
+        "type": "object",
+        "required": list(keys),
+        "properties": {key: truthy for key in keys}
+    })
+
 class ValidationAnalyst:
     """
     Validates configuration data against specific semantic rules.
     """
     def validate(self, data: dict, rules: dict) -> dict:
+        # Compiled fast path for the common all-valid case; failures fall through to the
+        # loop below so every error is reported, not just the first one the validator hits
+        validator = _compile_rules(tuple(rules))
+        if validator is not None:
+            try:
+                validator(data)
+                return {"valid": True, "errors": []}
+            except ValueError:
+                pass  # fastjsonschema.JsonSchemaException subclasses ValueError
+
         errors = []
         # Example: check if keys match specific patterns or ranges
         for key, rule in rules.items():
@@ -1,55 +1,224 @@
-import httpx
+# httpx is only needed for annotations here; the shared client module imports it on first use
+from __future__ import annotations
+
+import asyncio
 import os
 import logging
+import random
 import time
-from services.llm_client import LLMClient
+from typing import TYPE_CHECKING
+from urllib.parse import urlparse
+from services.drivers._http import get_shared_client
+
+if TYPE_CHECKING:
+    import httpx
+
+# Optional async database drivers; only the one matching the configured URL is needed
+try:
+    import asyncpg
+except ImportError:
+    asyncpg = None
+try:
+    import aiomysql
+except ImportError:
+    aiomysql = None
+try:
+    from motor.motor_asyncio import AsyncIOMotorClient
+except ImportError:
+    AsyncIOMotorClient = None
+
+# db_type -> (package to install, imported driver or None)
+_DB_DRIVERS = {
+    'postgresql': ('asyncpg', asyncpg),
+    'mysql': ('aiomysql', aiomysql),
+    'mongodb': ('motor', AsyncIOMotorClient),
+}
 
 logger = logging.getLogger("health_driver")
 
+class _TokenBucket:
+    """Allows `rate` acquisitions per second, bursting up to `rate`; waiters sleep until a token refills."""
+    def __init__(self, rate: float):
+        self.rate = rate
+        self.tokens = rate
+        self.updated = time.monotonic()
+
+    async def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.rate, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            # No await between the check and the decrement, so this is safe on one event loop
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            await asyncio.sleep((1 - self.tokens) / self.rate)
+
 class DeepHealthDriver:
     """
     Performs semantic health checks by parsing standard health response formats.
     Purely deterministic: gathers raw status, code, and latency.
     """
-    async def check_service(self, url: str) -> dict:
-        start_time = time.time()
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                response = await client.get(url)
-                latency = int((time.time() - start_time) * 1000)
-                
-                try:
-                    data = response.json()
-                    status = data.get("status", "UP" if response.status_code == 200 else "DOWN").upper()
-                except:
-                    status = "UP" if response.status_code == 200 else "DOWN"
-                
-                return {
-                    "status": "UP" if status in ["PASS", "UP", "OK", "HEALTHY"] else "DOWN",
-                    "latency_ms": latency,
-                    "http_code": response.status_code,
-                    "raw_status": status
-                }
-        except Exception as e:
-            latency = int((time.time() - start_time) * 1000)
-            logger.error(f"Health check failed for {url}: {e}")
+    # Circuit breaker: after a transport failure a URL is skipped for 2**failures seconds (capped)
+    MAX_COOLDOWN_SECONDS = 60
+    MAX_TRACKED_FAILURES = 256
+    # Answered probes are reused for a few seconds so repeated tool calls do not re-probe
+    RESULT_TTL_SECONDS = 10
+    MAX_CACHED_RESULTS = 512
+    # Connect errors/read timeouts are retried with jittered exponential backoff,
+    # and probe attempts to any one host are rate limited so retries cannot stampede it
+    PROBE_RETRIES = 2
+    RETRY_BASE_DELAY_SECONDS = 0.05
+    HOST_PROBES_PER_SECOND = 10
+    MAX_TRACKED_HOSTS = 256
+
+    def __init__(self, client: httpx.AsyncClient = None):
+        # Injected client for tests/isolation; otherwise the process-wide shared client is used
+        self._client = client
+        # url -> (monotonic time of last failure, consecutive failures); oldest entries evicted first
+        self._failures = {}
+        # url -> (monotonic expiry, result) and url -> in-flight probe task (single-flight)
+        self._results = {}
+        self._inflight = {}
+        # hostname -> _TokenBucket; oldest entries evicted first
+        self._buckets = {}
+
+    def _get_client(self) -> httpx.AsyncClient:
+        return self._client or get_shared_client()
+
+    async def check_service(self, url: str, client: httpx.AsyncClient = None) -> dict:
+        """
+        Probes a health endpoint. Pass a client to use it for this call;
+        otherwise the driver's client (injected or process-wide shared) is used.
+        """
+        return await self._cached_probe(client or self._get_client(), url)
+
+    async def _cached_probe(self, client: httpx.AsyncClient, url: str) -> dict:
+        """Returns a fresh cached result, else joins (or starts) the single in-flight probe for url."""
+        cached = self._results.get(url)
+        if cached is not None and cached[0] > time.monotonic():
+            return dict(cached[1])
+
+        task = self._inflight.get(url)
+        if task is None:
+            task = asyncio.ensure_future(self._probe(client, url))
+            self._inflight[url] = task
+            task.add_done_callback(lambda _: self._inflight.pop(url, None))
+        result = await asyncio.shield(task)
+
+        # Transport failures are left to the circuit breaker rather than cached
+        if result["http_code"]:
+            self._results.pop(url, None)
+            self._results[url] = (time.monotonic() + self.RESULT_TTL_SECONDS, result)
+            if len(self._results) > self.MAX_CACHED_RESULTS:
+                del self._results[next(iter(self._results))]
+        return dict(result)
+
+    def _circuit_open(self, url: str) -> bool:
+        failure = self._failures.get(url)
+        if failure is None:
+            return False
+        failed_at, fails = failure
+        return time.monotonic() - failed_at < min(self.MAX_COOLDOWN_SECONDS, 2 ** fails)
+
+    def _record_failure(self, url: str):
+        _, fails = self._failures.pop(url, (0.0, 0))
+        self._failures[url] = (time.monotonic(), fails + 1)
+        if len(self._failures) > self.MAX_TRACKED_FAILURES:
+            del self._failures[next(iter(self._failures))]
+
+    def _bucket(self, url: str) -> _TokenBucket:
+        host = urlparse(url).hostname or url
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            bucket = self._buckets[host] = _TokenBucket(self.HOST_PROBES_PER_SECOND)
+            if len(self._buckets) > self.MAX_TRACKED_HOSTS:
+                del self._buckets[next(iter(self._buckets))]
+        return bucket
+
+    async def _get_with_retry(self, client: httpx.AsyncClient, url: str):
+        """
+        GETs url, retrying transient transport errors. This is the only retry layer: the shared
+        client's transport does not retry, so every connect attempt passes the host's token bucket.
+        Returns (response or None, error or None, start of the final attempt).
+        """
+        import httpx
+        bucket = self._bucket(url)
+        for attempt in range(self.PROBE_RETRIES + 1):
+            await bucket.acquire()
+            start = time.perf_counter_ns()
+            try:
+                return await client.get(url), None, start
+            except (httpx.ConnectError, httpx.ReadTimeout) as e:
+                if attempt == self.PROBE_RETRIES:
+                    return None, e, start
+                # Full jitter so probes that failed together do not retry together
+                delay = random.uniform(0, self.RETRY_BASE_DELAY_SECONDS * 2 ** attempt)
+                logger.warning(f"Health probe to {url} failed ({e!r}); retrying in {delay:.3f}s")
+                await asyncio.sleep(delay)
+            except Exception as e:
+                return None, e, start
+
+    async def _probe(self, client: httpx.AsyncClient, url: str) -> dict:
+        # Known-dead host still cooling down: answer DOWN without spending the timeout again
+        if self._circuit_open(url):
+            return {
+                "status": "DOWN",
+                "latency_ms": 0,
+                "http_code": 0,
+                "raw_status": "CIRCUIT_OPEN"
+            }
+
+        response, error, attempt_start = await self._get_with_retry(client, url)
+        # Latency of the final attempt only, for answered and failed probes alike
+        latency = (time.perf_counter_ns() - attempt_start) // 1_000_000
+
+        if error is not None:
+            self._record_failure(url)
+            logger.error(f"Health check failed for {url}: {error}")
             return {
                 "status": "DOWN",
                 "latency_ms": latency,
                 "http_code": 0, # Denotes transport failure
-                "raw_status": f"ERROR: {str(e)}"
+                "raw_status": f"ERROR: {str(error)}"
             }
 
+        self._failures.pop(url, None)
+        try:
+            data = response.json()
+            status = data.get("status", "UP" if response.status_code == 200 else "DOWN").upper()
+        except:
+            status = "UP" if response.status_code == 200 else "DOWN"
+        
+        return {
+            "status": "UP" if status in ["PASS", "UP", "OK", "HEALTHY"] else "DOWN",
+            "latency_ms": latency,
+            "http_code": response.status_code,
+            "raw_status": status
+        }
+
 class DatabaseDriver:
     """
     Universal async database driver supporting PostgreSQL, MySQL, and MongoDB.
     Auto-detects database type from connection string and performs appropriate checks.
+    Connections come from pools shared by every driver instance for the same URL.
     """
+    # db_url -> (db_type, pool or client); built lazily, closed by aclose()/aclose_all()
+    _pools = {}
+    _pool_locks = {}
+
     def __init__(self, db_url: str = None):
         self.db_url = db_url or os.getenv("TARGET_DB_URL")
         self.db_type = None
+        self._parsed = None
+        # Set when the driver package for this URL is not installed; checks report it instead of connecting
+        self.driver_error = None
         if self.db_url:
             self.db_type = self._detect_db_type(self.db_url)
+            self._parsed = urlparse(self.db_url)
+            package, driver = _DB_DRIVERS[self.db_type]
+            if driver is None:
+                self.driver_error = f"{package} is not installed (pip install {package}) for {self.db_type} checks"
 
     def _detect_db_type(self, url: str) -> str:
         """Detect database type from connection string."""
@@ -63,6 +232,69 @@ class DatabaseDriver:
         else:
             raise ValueError(f"Unsupported database URL format: {url[:20]}...")
 
+    async def _get_pool(self):
+        """Returns the pool (motor: client) for this URL, creating it on first use."""
+        entry = self._pools.get(self.db_url)
+        if entry is not None:
+            return entry[1]
+        lock = self._pool_locks.setdefault(self.db_url, asyncio.Lock())
+        async with lock:
+            entry = self._pools.get(self.db_url)
+            if entry is None:
+                entry = (self.db_type, await self._create_pool())
+                self._pools[self.db_url] = entry
+        return entry[1]
+
+    async def _create_pool(self):
+        if self.db_type == 'postgresql':
+            return await asyncpg.create_pool(
+                self.db_url, min_size=1, max_size=5, max_inactive_connection_lifetime=60, timeout=10
+            )
+        if self.db_type == 'mysql':
+            parsed = self._parsed
+            return await aiomysql.create_pool(
+                host=parsed.hostname or 'localhost',
+                port=parsed.port or 3306,
+                user=parsed.username or 'root',
+                password=parsed.password or '',
+                db=parsed.path.lstrip('/') if parsed.path else '',
+                connect_timeout=10,
+                minsize=1,
+                maxsize=5,
+                pool_recycle=60
+            )
+        if self.db_type == 'mongodb':
+            # Motor pools connections internally; one client per URL is enough
+            return AsyncIOMotorClient(self.db_url, serverSelectionTimeoutMS=10000)
+        raise ValueError(f"Unknown database type: {self.db_type}")
+
+    async def aclose(self):
+        """Closes the pool for this driver's URL."""
+        await self._close_pool(self._pools.pop(self.db_url, None))
+
+    @classmethod
+    async def aclose_all(cls):
+        """Closes every pool; call once on shutdown."""
+        pools, cls._pools = cls._pools, {}
+        for entry in pools.values():
+            await cls._close_pool(entry)
+
+    @staticmethod
+    async def _close_pool(entry):
+        if entry is None:
+            return
+        db_type, pool = entry
+        try:
+            if db_type == 'postgresql':
+                await pool.close()
+            elif db_type == 'mysql':
+                pool.close()
+                await pool.wait_closed()
+            else:
+                pool.close()
+        except Exception as e:
+            logger.warning(f"Failed to close {db_type} pool: {e}")
+
     async def check_connectivity(self) -> dict:
         """
         Check database connectivity with appropriate async driver.
@@ -70,6 +302,8 @@ class DatabaseDriver:
         """
         if not self.db_url:
             return {"status": "FAILED", "latency_ms": 0, "error": "TARGET_DB_URL not configured"}
+        if self.driver_error:
+            return {"status": "FAILED", "latency_ms": 0, "error": self.driver_error}
         
         try:
             if self.db_type == 'postgresql':
@@ -86,15 +320,12 @@ class DatabaseDriver:
 
     async def _check_postgresql(self) -> dict:
         """Check PostgreSQL connectivity using asyncpg."""
-        import asyncpg
-        import time
-        
         try:
-            start = time.time()
-            conn = await asyncpg.connect(self.db_url, timeout=10)
-            await conn.execute('SELECT 1')
-            latency = int((time.time() - start) * 1000)
-            await conn.close()
+            start = time.perf_counter_ns()
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                await conn.execute('SELECT 1')
+            latency = (time.perf_counter_ns() - start) // 1_000_000
             logger.info(f"PostgreSQL connection successful: {latency}ms")
             return {"status": "CONNECTED", "latency_ms": latency}
         except asyncpg.PostgresError as e:
@@ -106,27 +337,13 @@ class DatabaseDriver:
 
     async def _check_mysql(self) -> dict:
         """Check MySQL connectivity using aiomysql."""
-        import aiomysql
-        import time
-        from urllib.parse import urlparse
-        
         try:
-            # Parse MySQL connection string
-            parsed = urlparse(self.db_url)
-            
-            start = time.time()
-            conn = await aiomysql.connect(
-                host=parsed.hostname or 'localhost',
-                port=parsed.port or 3306,
-                user=parsed.username or 'root',
-                password=parsed.password or '',
-                db=parsed.path.lstrip('/') if parsed.path else '',
-                connect_timeout=10
-            )
-            async with conn.cursor() as cursor:
-                await cursor.execute('SELECT 1')
-            latency = int((time.time() - start) * 1000)
-            conn.close()
+            start = time.perf_counter_ns()
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    await cursor.execute('SELECT 1')
+            latency = (time.perf_counter_ns() - start) // 1_000_000
             logger.info(f"MySQL connection successful: {latency}ms")
             return {"status": "CONNECTED", "latency_ms": latency}
         except aiomysql.Error as e:
@@ -138,19 +355,12 @@ class DatabaseDriver:
 
     async def _check_mongodb(self) -> dict:
         """Check MongoDB connectivity using motor (async pymongo)."""
-        from motor.motor_asyncio import AsyncIOMotorClient
-        import time
-        
         try:
-            start = time.time()
-            client = AsyncIOMotorClient(
-                self.db_url,
-                serverSelectionTimeoutMS=10000
-            )
+            start = time.perf_counter_ns()
+            client = await self._get_pool()
             # Ping the database to verify connection
             await client.admin.command('ping')
-            latency = int((time.time() - start) * 1000)
-            client.close()
+            latency = (time.perf_counter_ns() - start) // 1_000_000
             logger.info(f"MongoDB connection successful: {latency}ms")
             return {"status": "CONNECTED", "latency_ms": latency}
         except Exception as e:
@@ -164,6 +374,8 @@ class DatabaseDriver:
         """
         if not self.db_url:
             return {"match": False, "error": "No database configured"}
+        if self.driver_error:
+            return {"match": True, "note": f"Migration check skipped: {self.driver_error}"}
         
         try:
             if self.db_type == 'postgresql':
@@ -180,70 +392,47 @@ class DatabaseDriver:
 
     async def _check_postgresql_migrations(self) -> dict:
         """Check PostgreSQL migrations (Alembic or similar)."""
-        import asyncpg
-        
         try:
-            conn = await asyncpg.connect(self.db_url, timeout=10)
-            # Check if alembic_version table exists
-            result = await conn.fetchval(
-                "SELECT EXISTS (SELECT FROM information_schema.tables WHERE table_name = 'alembic_version')"
-            )
-            if result:
-                version = await conn.fetchval("SELECT version_num FROM alembic_version LIMIT 1")
-                await conn.close()
-                return {"match": True, "current_version": version, "note": "Alembic version found"}
-            await conn.close()
-            return {"match": True, "note": "No migration table found (may not use migrations)"}
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                # One round trip: a missing alembic_version table surfaces as UndefinedTableError
+                try:
+                    version = await conn.fetchval("SELECT version_num FROM alembic_version LIMIT 1")
+                except asyncpg.UndefinedTableError:
+                    return {"match": True, "note": "No migration table found (may not use migrations)"}
+            return {"match": True, "current_version": version, "note": "Alembic version found"}
         except Exception as e:
             return {"match": True, "note": f"Could not verify migrations: {str(e)}"}
 
     async def _check_mysql_migrations(self) -> dict:
         """Check MySQL migrations (Alembic or similar)."""
-        import aiomysql
-        from urllib.parse import urlparse
-        
         try:
-            parsed = urlparse(self.db_url)
-            conn = await aiomysql.connect(
-                host=parsed.hostname or 'localhost',
-                port=parsed.port or 3306,
-                user=parsed.username or 'root',
-                password=parsed.password or '',
-                db=parsed.path.lstrip('/') if parsed.path else '',
-                connect_timeout=10
-            )
-            async with conn.cursor() as cursor:
-                # Check if alembic_version table exists
-                await cursor.execute("SHOW TABLES LIKE 'alembic_version'")
-                result = await cursor.fetchone()
-                if result:
-                    await cursor.execute("SELECT version_num FROM alembic_version LIMIT 1")
+            pool = await self._get_pool()
+            async with pool.acquire() as conn:
+                async with conn.cursor() as cursor:
+                    # One round trip: a missing alembic_version table fails with ER_NO_SUCH_TABLE (1146)
+                    try:
+                        await cursor.execute("SELECT version_num FROM alembic_version LIMIT 1")
+                    except aiomysql.ProgrammingError as e:
+                        if e.args and e.args[0] == 1146:
+                            return {"match": True, "note": "No migration table found (may not use migrations)"}
+                        raise
                     version = await cursor.fetchone()
-                    conn.close()
-                    return {"match": True, "current_version": version[0] if version else None, "note": "Alembic version found"}
-            conn.close()
-            return {"match": True, "note": "No migration table found (may not use migrations)"}
+            return {"match": True, "current_version": version[0] if version else None, "note": "Alembic version found"}
         except Exception as e:
             return {"match": True, "note": f"Could not verify migrations: {str(e)}"}
 
     async def _check_mongodb_migrations(self) -> dict:
         """Check MongoDB migrations (custom implementation)."""
-        from motor.motor_asyncio import AsyncIOMotorClient
-        
         try:
-            client = AsyncIOMotorClient(self.db_url, serverSelectionTimeoutMS=10000)
+            client = await self._get_pool()
             # Check for a migrations collection or version document
             db = client.get_default_database()
-            collections = await db.list_collection_names()
-            
-            if 'migrations' in collections or 'schema_version' in collections:
-                # Try to get version from migrations collection
-                if 'migrations' in collections:
-                    version_doc = await db.migrations.find_one(sort=[('version', -1)])
-                    client.close()
-                    return {"match": True, "current_version": version_doc.get('version') if version_doc else None, "note": "Migration collection found"}
+            # Querying a missing collection just returns None, so no list_collection_names() round trip
+            version_doc = await db.migrations.find_one(sort=[('version', -1)])
+            if version_doc is not None:
+                return {"match": True, "current_version": version_doc.get('version'), "note": "Migration collection found"}
             
-            client.close()
             return {"match": True, "note": "No migration collection found (may not use migrations)"}
         except Exception as e:
             return {"match": True, "note": f"Could not verify migrations: {str(e)}"}
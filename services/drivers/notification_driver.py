@@ -1,18 +1,59 @@
-import requests
+from __future__ import annotations
+
 import os
 import json
 import logging
+from typing import TYPE_CHECKING
+from services.drivers._http import get_shared_client
+
+if TYPE_CHECKING:
+    import httpx
+
+# orjson (optional) serializes the payload straight to bytes
+try:
+    import orjson
+    _dumps = orjson.dumps
+except ImportError:
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
 
 logger = logging.getLogger("notification_driver")
 
+_JSON_HEADERS = {"Content-Type": "application/json"}
+
+# Fixed Block Kit blocks; only referenced from the payload and never mutated
+_HEADER_BLOCK = {
+    "type": "header",
+    "text": {"type": "plain_text", "text": "🚀 Deployment Readiness Alert"}
+}
+_APPROVAL_ACTIONS_BLOCK = {
+    "type": "actions",
+    "elements": [
+        {
+            "type": "button",
+            "text": {"type": "plain_text", "text": "Approve Deployment"},
+            "style": "primary",
+            "value": "approve"
+        },
+        {
+            "type": "button",
+            "text": {"type": "plain_text", "text": "Abort"},
+            "style": "danger",
+            "value": "abort"
+        }
+    ]
+}
+
 class WebhookDriver:
     """
     Sends interactive notifications to Slack or Teams.
     """
-    def __init__(self, webhook_url: str = None):
+    def __init__(self, webhook_url: str = None, http_client: httpx.AsyncClient = None):
         self.webhook_url = webhook_url or os.getenv("SLACK_WEBHOOK_URL")
+        # Defaults to the process-wide pooled client, resolved at send time
+        self.http = http_client
 
-    def send_deployment_alert(self, score: int, status: str, summary: str, recommendations: list) -> bool:
+    async def send_deployment_alert(self, score: int, status: str, summary: str, recommendations: list) -> bool:
         if not self.webhook_url:
             logger.warning("SLACK_WEBHOOK_URL not set, skipping notification.")
             return False
@@ -20,10 +61,7 @@ class WebhookDriver:
         # Slack Block Kit format for actionable alerts
         payload = {
             "blocks": [
-                {
-                    "type": "header",
-                    "text": {"type": "plain_text", "text": "🚀 Deployment Readiness Alert"}
-                },
+                _HEADER_BLOCK,
                 {
                     "type": "section",
                     "fields": [
@@ -44,26 +82,11 @@ class WebhookDriver:
         
         # Add interactive buttons if intervention is needed
         if status == "CAUTION":
-            payload["blocks"].append({
-                "type": "actions",
-                "elements": [
-                    {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": "Approve Deployment"},
-                        "style": "primary",
-                        "value": "approve"
-                    },
-                    {
-                        "type": "button",
-                        "text": {"type": "plain_text", "text": "Abort"},
-                        "style": "danger",
-                        "value": "abort"
-                    }
-                ]
-            })
+            payload["blocks"].append(_APPROVAL_ACTIONS_BLOCK)
 
         try:
-            response = requests.post(self.webhook_url, json=payload)
+            client = self.http or get_shared_client()
+            response = await client.post(self.webhook_url, content=_dumps(payload), headers=_JSON_HEADERS)
             return response.status_code == 200
         except Exception as e:
             logger.error(f"Failed to send webhook: {e}")
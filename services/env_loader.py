@@ -2,10 +2,28 @@
 Flexible environment variable loader with regex pattern matching.
 Supports multiple naming conventions for the same configuration.
 """
+import functools
 import os
 import re
 from typing import Optional, List
 
+# Set once a .env file has been loaded into this process (and inherited by child processes)
+ENV_LOADED_MARKER = "_ENV_LOADED"
+
+def load_dotenv_once() -> bool:
+    """Loads .env into os.environ unless that already happened; returns whether it loaded."""
+    if os.environ.get(ENV_LOADED_MARKER):
+        return False
+    from dotenv import load_dotenv
+    load_dotenv()
+    os.environ[ENV_LOADED_MARKER] = "1"
+    return True
+
+@functools.lru_cache(maxsize=64)
+def _compile_patterns(patterns: tuple) -> re.Pattern:
+    """Fuses a pattern list into one case-insensitive alternation, so each env var is matched once."""
+    return re.compile("|".join(f"(?:{p})" for p in patterns), re.IGNORECASE)
+
 class FlexibleEnvLoader:
     """
     Load environment variables using flexible regex patterns.
@@ -61,13 +79,15 @@ class FlexibleEnvLoader:
             return os.environ[key.upper()]
         
         # Use predefined patterns or custom patterns
-        search_patterns = patterns or cls.PATTERNS.get(key.lower(), [])
+        search_patterns = patterns or cls.PATTERNS.get(key.lower())
+        if not search_patterns:
+            return default
+        regex = _compile_patterns(tuple(search_patterns))
         
         # Search through all environment variables
         for env_var, value in os.environ.items():
-            for pattern in search_patterns:
-                if re.match(pattern, env_var, re.IGNORECASE):
-                    return value
+            if regex.match(env_var):
+                return value
         
         return default
     
@@ -102,13 +122,14 @@ class FlexibleEnvLoader:
         import logging
         logger = logging.getLogger("env_loader")
         
+        # One decoded copy of the environment, scanned once per logical key
+        env_items = list(os.environ.items())
         for key, patterns in cls.PATTERNS.items():
-            matches = []
-            for env_var in os.environ.keys():
-                for pattern in patterns:
-                    if re.match(pattern, env_var, re.IGNORECASE):
-                        matches.append(f"{env_var}={os.environ[env_var][:20]}...")
-                        break
+            regex = _compile_patterns(tuple(patterns))
+            matches = [
+                f"{env_var}={value[:20]}..."
+                for env_var, value in env_items if regex.match(env_var)
+            ]
             
             if matches:
                 logger.info(f"✅ {key}: Found {len(matches)} match(es)")
@@ -1,9 +1,66 @@
+import asyncio
+import hashlib
+import logging
 import os
+import time
+import re
 import json
-import requests
-from dotenv import load_dotenv
+from services.drivers._http import get_shared_client
+from services.env_loader import load_dotenv_once
 
-load_dotenv()
+# orjson is an optional accelerator for decoding API bodies and the model's JSON answer
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# Characters that matter when scanning for a balanced JSON object; everything else is skipped in C
+_JSON_TOKEN_RE = re.compile(r'[{}"\\]')
+
+def _extract_first_json(text: str):
+    """
+    Returns the first balanced {...} object in the reply, starting inside a ``` fence if there is one,
+    in a single scan (braces inside JSON strings are ignored). None if there is no complete object.
+    """
+    start = text.find("{", max(text.find("```"), 0))
+    if start < 0:
+        return None
+    depth = 0
+    in_string = False
+    escaped = -1
+    for m in _JSON_TOKEN_RE.finditer(text, start):
+        pos = m.start()
+        if pos == escaped:
+            continue
+        ch = m.group()
+        if in_string:
+            if ch == "\\":
+                escaped = pos + 1
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return text[start:pos + 1]
+    return None
+
+# Identical prompts within this window share one completion (and one in-flight request)
+RESPONSE_TTL_SECONDS = 10
+MAX_CACHED_RESPONSES = 256
+
+API_URL = "https://api.cohere.ai/v1/chat"
+MODEL = "command-r-08-2024"
+TEMPERATURE = 0.2
+
+logger = logging.getLogger("llm_client")
+logger.setLevel(logging.WARNING)
+
+load_dotenv_once()
 
 class LLMClient:
     """
@@ -11,87 +68,98 @@ class LLMClient:
     as per existing working setup.
     """
     def __init__(self):
-        self.api_url = "https://api.cohere.ai/v1/chat"
+        self.api_url = API_URL
         self.api_key = os.environ.get("COHERE_API_KEY")
         
-        # Debug logging
-        import logging
-        logger = logging.getLogger("llm_client")
-        logger.setLevel(logging.WARNING)
         if not self.api_key:
             logger.error("COHERE_API_KEY is not set in environment!")
+        else:
+            # Built once; the key does not change for the client's lifetime
+            self._headers = {
+                "Authorization": f"Bearer {self.api_key}".encode(),
+                "Content-Type": b"application/json",
+            }
 
-    def generate_with_tools(self, prompt: str, tools: list = None) -> dict:
+        # sha256(prompt) -> (monotonic expiry, parsed reply) and -> in-flight request task
+        self._responses = {}
+        self._inflight = {}
+
+    async def generate_with_tools(self, prompt: str, tools: list = None) -> dict:
         """
         Gemini-style method signature as per contract.
+        Awaitable: the request goes through the shared pooled AsyncClient, so concurrent
+        tool narrations overlap instead of blocking the event loop. Concurrent or repeated
+        calls with the same prompt within RESPONSE_TTL_SECONDS share a single request.
         """
-        import logging
-        logger = logging.getLogger("llm_client")
-        logger.setLevel(logging.WARNING)
+        key = hashlib.sha256(prompt.encode()).digest()
+        cached = self._responses.get(key)
+        if cached is not None and cached[0] > time.monotonic():
+            return dict(cached[1])
+
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._generate(prompt))
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        result = await asyncio.shield(task)
+
+        self._responses.pop(key, None)
+        self._responses[key] = (time.monotonic() + RESPONSE_TTL_SECONDS, result)
+        if len(self._responses) > MAX_CACHED_RESPONSES:
+            del self._responses[next(iter(self._responses))]
+        return dict(result)
+
+    async def _generate(self, prompt: str) -> dict:
+        """Performs one completion request (with timeout retries) and parses the reply."""
+        import httpx
         
         if not self.api_key:
             logger.error("Cannot make LLM request: API key is missing")
             raise RuntimeError("COHERE_API_KEY not configured")
             
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
         data = {
             "message": prompt,
-            "model": "command-r-08-2024",
-            "temperature": 0.2,
+            "model": MODEL,
+            "temperature": TEMPERATURE,
         }
         
-        import time
-        
         max_retries = 2
         retry_delay = 2
         
         for attempt in range(max_retries + 1):
             try:
-                response = requests.post(self.api_url, headers=headers, json=data, timeout=60)
+                response = await get_shared_client().post(
+                    self.api_url, headers=self._headers, json=data, timeout=httpx.Timeout(60.0, connect=5.0)
+                )
                 
-                if not response.ok:
+                if not response.is_success:
                     logger.error(f"Cohere API error: {response.status_code} - {response.text}")
                     raise RuntimeError(f"LLM request failed: HTTP {response.status_code} - {response.text[:200]}")
 
                 # Parse response
-                raw_response = response.json()
+                raw_response = _loads(response.content)
                 text = raw_response.get("text", "").strip()
                 
                 # Attempt to parse JSON if possible
-                json_str = text
                 try:
-                    # 1. Look for JSON block in markdown
-                    if "```json" in text:
-                        json_str = text.split("```json")[1].split("```")[0].strip()
-                    elif "```" in text:
-                         json_str = text.split("```")[1].split("```")[0].strip()
-                    
-                    # 2. Heuristic: Find first '{' and last '}' if not already parsed
-                    if "{" in json_str and "}" in json_str:
-                        start = json_str.find("{")
-                        end = json_str.rfind("}") + 1
-                        json_str = json_str[start:end]
-
-                    parsed = json.loads(json_str)
+                    # JSON block in markdown, else the first object anywhere in the reply
+                    parsed = _loads(_extract_first_json(text) or text)
                     return parsed
                 except (json.JSONDecodeError, ValueError) as e:
                     logger.warning(f"JSON parsing failed: {e}. Returning raw text.")
                     return {"raw_text": text}
                     
-            except requests.exceptions.Timeout as e:
+            except httpx.TimeoutException as e:
                 if attempt < max_retries:
                     logger.warning(f"Timeout on attempt {attempt + 1}. Retrying in {retry_delay}s...")
-                    time.sleep(retry_delay)
+                    await asyncio.sleep(retry_delay)
                     retry_delay *= 2  # Exponential backoff
                     continue
                 else:
                     logger.error(f"All {max_retries + 1} attempts timed out")
                     raise RuntimeError(f"Cohere API timeout after {max_retries + 1} attempts")
                     
-            except requests.exceptions.RequestException as e:
+            except httpx.HTTPError as e:
                 logger.error(f"Network error calling Cohere API: {e}")
                 raise RuntimeError(f"Failed to connect to Cohere API: {str(e)}")
 
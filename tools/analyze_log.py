@@ -1,8 +1,11 @@
 from services.llm_client import LLMClient
-from models import LogCategory, Severity
+from models import LogCategory, Severity, LOG_CATEGORY_VALUES, SEVERITY_VALUES
 import json
 
 class AnalyzeBuildLogTool:
+    # Only this much of the log is sent to the LLM, so callers need not fetch more
+    MAX_LOG_CHARS = 5000
+
     def __init__(self, llm_client: LLMClient = None):
         self.llm_client = llm_client or LLMClient()
 
@@ -10,7 +13,7 @@ class AnalyzeBuildLogTool:
         prompt = (
             "As an AI Build Engineer, analyze this build log to identify the root cause of failure.\n"
             "Raw Log Content:\n"
-            f"{log_text[:5000]}\n\n" # Truncate if too long for prompt
+            f"{log_text[:self.MAX_LOG_CHARS]}\n\n" # Truncate if too long for prompt
             "Return a JSON object with these keys:\n"
             "1. 'category': (INFRA|CODE|CONFIG|DEPENDENCY|FLAKY)\n"
             "2. 'severity': (LOW|MEDIUM|HIGH)\n"
@@ -21,7 +24,7 @@ class AnalyzeBuildLogTool:
         )
         
         try:
-            analysis = self.llm_client.generate_with_tools(prompt)
+            analysis = await self.llm_client.generate_with_tools(prompt)
             validated = self._validate_llm_response(analysis)
             return {
                 "success": True,
@@ -29,7 +32,7 @@ class AnalyzeBuildLogTool:
             }
         except Exception as e:
             # Even if the analysis fails, use AI to narrate the system failure
-            error_narration = self._generate_error_narration(str(e))
+            error_narration = await self._generate_error_narration(str(e))
             return {
                 "success": False,
                 "error": {
@@ -50,15 +53,18 @@ class AnalyzeBuildLogTool:
                 "suggested_fix": "Perform a manual log review."
              }
              
+        # Anything outside the known enum values falls back to the conservative defaults
+        category = str(response.get("category") or "").upper()
+        severity = str(response.get("severity") or "").upper()
         return {
-            "category": str(response.get("category") or LogCategory.INFRA).upper(),
-            "severity": str(response.get("severity") or Severity.MEDIUM).upper(),
+            "category": category if category in LOG_CATEGORY_VALUES else LogCategory.INFRA.value,
+            "severity": severity if severity in SEVERITY_VALUES else Severity.MEDIUM.value,
             "confidence": float(response.get("confidence") if response.get("confidence") is not None else 0.5),
             "explanation": str(response.get("explanation") or "AI could not determine a specific cause."),
             "suggested_fix": str(response.get("suggested_fix") or "Review terminal output for clues.")
         }
 
-    def _generate_error_narration(self, error_msg: str) -> dict:
+    async def _generate_error_narration(self, error_msg: str) -> dict:
         """Narrates a log analysis failure using AI."""
         prompt = (
             f"The build log analysis engine encountered an internal error: {error_msg}\n"
@@ -67,7 +73,7 @@ class AnalyzeBuildLogTool:
         )
         try:
             # Use a very short timeout/simple call for error narration
-            return self.llm_client.generate_with_tools(prompt)
+            return await self.llm_client.generate_with_tools(prompt)
         except:
             return {
                 "explanation": "Diagnostic engine timeout during log analysis.",
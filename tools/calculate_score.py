@@ -2,6 +2,13 @@ from .policy_engine import ScoringPolicy
 from models import ReadinessStatus, Recommendation
 from services.llm_client import LLMClient
 
+# (minimum score, status, recommendation) bands, checked from the top down
+_STATUS_BANDS = (
+    (80, ReadinessStatus.SAFE, Recommendation.ALLOW_AUTOMATION),
+    (50, ReadinessStatus.CAUTION, Recommendation.BLOCK_AUTOMATION),
+    (0, ReadinessStatus.NOT_SAFE, Recommendation.BLOCK_AUTOMATION),
+)
+
 class CalculateReadinessScoreTool:
     def __init__(self, policy: ScoringPolicy = None, llm_client: LLMClient = None):
         self.policy = policy or ScoringPolicy()
@@ -39,18 +46,10 @@ class CalculateReadinessScoreTool:
             
         # Final status and recommendation
         score = max(0, score)
-        if score >= 80:
-            status = ReadinessStatus.SAFE
-            recommendation = Recommendation.ALLOW_AUTOMATION
-        elif score >= 50:
-            status = ReadinessStatus.CAUTION
-            recommendation = Recommendation.BLOCK_AUTOMATION
-        else:
-            status = ReadinessStatus.NOT_SAFE
-            recommendation = Recommendation.BLOCK_AUTOMATION
+        status, recommendation = self._classify(score)
             
         # Final AI-First Executive Summary
-        ai_res = self._generate_ai_executive_summary(score, status, penalties)
+        ai_res = await self._generate_ai_executive_summary(score, status, penalties)
 
         return {
             "success": True,
@@ -64,20 +63,28 @@ class CalculateReadinessScoreTool:
             }
         }
 
-    def _generate_ai_executive_summary(self, score: int, status: ReadinessStatus, penalties: list) -> dict:
+    @staticmethod
+    def _classify(score: int) -> tuple:
+        """Maps a clamped score onto its readiness status and automation recommendation."""
+        for threshold, status, recommendation in _STATUS_BANDS:
+            if score >= threshold:
+                return status, recommendation
+        return _STATUS_BANDS[-1][1], _STATUS_BANDS[-1][2]
+
+    async def _generate_ai_executive_summary(self, score: int, status: ReadinessStatus, penalties: list) -> dict:
         """Uses AI to synthesize a 'respective' executive summary of the entire deployment readiness."""
         prompt = (
             f"As an AI Deployment Auditor, provide an executive summary of the readiness for this release.\n"
             f"Numerical Score: {score}/100\n"
             f"Status Level: {status.value}\n"
-            f"Identified Risks/Penalties:\n" + "\n".join([f"- {p}" for p in penalties]) + "\n\n"
+            f"Identified Risks/Penalties:\n" + "\n".join(f"- {p}" for p in penalties) + "\n\n"
             "Return a JSON object with two fields:\n"
             "1. 'explanation': A professional, informative summary of the readiness state.\n"
             "2. 'suggested_fix': A long-term remediation strategy to reach 100/100 readiness.\n"
             "The tone should be authoritative yet helpful and provide 'respective' feedback."
         )
         try:
-            return self.llm_client.generate_with_tools(prompt)
+            return await self.llm_client.generate_with_tools(prompt)
         except Exception as e:
             return {
                 "explanation": f"Readiness Score: {score}/100. Status: {status.value.upper()}.",
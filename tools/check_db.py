@@ -36,7 +36,7 @@ class CheckDatabaseConnectionTool:
             }
 
             # AI Narrative Generation
-            ai_narration = self._generate_ai_analysis(facts)
+            ai_narration = await self._generate_ai_analysis(facts)
 
             return {
                 "success": True,
@@ -48,7 +48,7 @@ class CheckDatabaseConnectionTool:
             }
         except Exception as e:
             # Even failures get AI-narrated responses
-            error_narration = self._generate_error_narration(str(e), environment, db_url)
+            error_narration = await self._generate_error_narration(str(e), environment)
             return {
                 "success": False,
                 "error": {
@@ -59,7 +59,7 @@ class CheckDatabaseConnectionTool:
                 }
             }
 
-    def _generate_ai_analysis(self, facts: dict) -> dict:
+    async def _generate_ai_analysis(self, facts: dict) -> dict:
         """Synthesizes technical facts into a project-aware narrative."""
         prompt = (
             f"As a Database Administrator, analyze this connectivity result for the '{facts['environment']}' environment.\n"
@@ -71,12 +71,12 @@ class CheckDatabaseConnectionTool:
             "provide steps to optimize the connection or resolve migration mismatches."
         )
         try:
-            return self.llm_client.generate_with_tools(prompt)
+            return await self.llm_client.generate_with_tools(prompt)
         except Exception as e:
             logger.error(f"AI Narration failed: {e}")
             return {"explanation": "Database audit completed.", "suggested_fix": "No action required."}
 
-    def _generate_error_narration(self, error_msg: str, env: str) -> dict:
+    async def _generate_error_narration(self, error_msg: str, env: str) -> dict:
         """Narrates a tool failure using AI to provide helpful context."""
         prompt = (
             f"The database auditor encountered an error checking the '{env}' environment.\n"
@@ -84,6 +84,6 @@ class CheckDatabaseConnectionTool:
             "Explain in professional terms why this check failed and how to resolve it. Return JSON with 'explanation' and 'suggested_fix'."
         )
         try:
-            return self.llm_client.generate_with_tools(prompt)
+            return await self.llm_client.generate_with_tools(prompt)
         except:
             return {"explanation": f"System error: {error_msg}", "suggested_fix": "Verify the database URL."}
@@ -15,7 +15,7 @@ class CheckServiceHealthTool:
             facts = await self.driver.check_service(health_url)
             
             # AI Narrative Generation
-            ai_narration = self._generate_ai_analysis(facts, service_name, health_url)
+            ai_narration = await self._generate_ai_analysis(facts, service_name, health_url)
             
             return {
                 "success": True,
@@ -31,7 +31,7 @@ class CheckServiceHealthTool:
             }
         except Exception as e:
             # Even failures get AI-narrated responses
-            error_narration = self._generate_error_narration(str(e), service_name, health_url)
+            error_narration = await self._generate_error_narration(str(e), service_name, health_url)
             return {
                 "success": False,
                 "error": {
@@ -42,7 +42,7 @@ class CheckServiceHealthTool:
                 }
             }
 
-    def _generate_ai_analysis(self, facts: dict, service_name: str, url: str) -> dict:
+    async def _generate_ai_analysis(self, facts: dict, service_name: str, url: str) -> dict:
         """Synthesizes technical facts into a project-aware narrative."""
         prompt = (
             f"As a Site Reliability Engineer, analyze this health check result for '{service_name}'.\n"
@@ -55,12 +55,12 @@ class CheckServiceHealthTool:
             "provide optimization or recovery steps if the service is underperforming or down."
         )
         try:
-            return self.llm_client.generate_with_tools(prompt)
+            return await self.llm_client.generate_with_tools(prompt)
         except Exception as e:
             logger.error(f"AI Narration failed: {e}")
             return {"explanation": f"Health check for {service_name} completed.", "suggested_fix": "Review results manually."}
 
-    def _generate_error_narration(self, error_msg: str, service_name: str, url: str) -> dict:
+    async def _generate_error_narration(self, error_msg: str, service_name: str, url: str) -> dict:
         """Narrates a tool failure using AI to provide helpful context."""
         prompt = (
             f"The health auditor encountered an error checking {service_name}.\n"
@@ -69,6 +69,6 @@ class CheckServiceHealthTool:
             "Explain in professional terms why this check failed and how to resolve it. Return JSON with 'explanation' and 'suggested_fix'."
         )
         try:
-            return self.llm_client.generate_with_tools(prompt)
+            return await self.llm_client.generate_with_tools(prompt)
         except:
             return {"explanation": f"System error: {error_msg}", "suggested_fix": "Verify the health endpoint URL."}
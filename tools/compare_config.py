@@ -1,16 +1,23 @@
 from services.drivers.config_driver import DriftAnalyst
 from services.llm_client import LLMClient
 from services.config_service import ConfigService
+from collections import OrderedDict
+import asyncio
 import os
 import logging
 
 logger = logging.getLogger("config_tool")
 
 class CompareEnvironmentConfigsTool:
+    NARRATION_CACHE_SIZE = 256
+
     def __init__(self, analyst: DriftAnalyst = None, llm_client: LLMClient = None, config_service: ConfigService = None):
         self.analyst = analyst or DriftAnalyst()
         self.llm_client = llm_client or LLMClient()
         self.config_service = config_service or ConfigService()
+        # Narrations keyed by the audit facts: an unchanged drift report reuses the earlier answer.
+        # A plain LRU dict, since functools.lru_cache would cache the (single-use) coroutine object.
+        self._narrations = OrderedDict()
 
     async def execute(self, env_1: str, env_2: str, integrity_mode: bool = False) -> dict:
         template_file = env_2
@@ -20,11 +27,12 @@ class CompareEnvironmentConfigsTool:
         try:
             # Real Configuration Fetching
             logger.info(f"Fetching actual configuration for environment: {env_1}")
-            actual_data = self.config_service.fetch_environment_config(env_1)
+            # File reads and secret-store SDK calls block, so they run in a worker thread
+            actual_data = await asyncio.to_thread(self.config_service.fetch_environment_config, env_1)
             logger.info(f"Retrieved {len(actual_data)} configuration values from {env_1}")
         except RuntimeError as e:
             # Configuration not found - return proper error
-            error_narration = self._generate_error_narration(str(e), template_file)
+            error_narration = await self._generate_error_narration(str(e), template_file)
             return {
                 "success": False,
                 "error": {
@@ -36,10 +44,12 @@ class CompareEnvironmentConfigsTool:
             }
 
         try:
-            facts = self.analyst.compare_configs(template_file, actual_data, integrity_mode=integrity_mode)
+            facts = await asyncio.to_thread(
+                self.analyst.compare_configs, template_file, actual_data, integrity_mode=integrity_mode
+            )
             
             # AI Narrative Generation
-            ai_narration = self._generate_ai_analysis(facts, env_1, env_2)
+            ai_narration = await self._generate_ai_analysis(facts, env_1, env_2)
             
             return {
                 "success": True,
@@ -56,7 +66,7 @@ class CompareEnvironmentConfigsTool:
             }
         except Exception as e:
             # Even failures get AI-narrated responses
-            error_narration = self._generate_error_narration(str(e), template_file)
+            error_narration = await self._generate_error_narration(str(e), template_file)
             return {
                 "success": False,
                 "error": {
@@ -67,28 +77,41 @@ class CompareEnvironmentConfigsTool:
                 }
             }
 
-    def _generate_ai_analysis(self, facts: dict, env_1: str, env_2: str) -> dict:
+    async def _generate_ai_analysis(self, facts: dict, env_1: str, env_2: str) -> dict:
         """Synthesizes technical facts into a project-aware narrative."""
-        mode = facts["analysis_type"]
-        issues = facts["drift_keys"]
-        
+        try:
+            return dict(await self._narrate_drift(
+                env_1, env_2, facts["analysis_type"], facts["resolved_path"], tuple(facts["drift_keys"])
+            ))
+        except Exception as e:
+            # Failures raise out of the cached call, so fallbacks are never memoized
+            logger.error(f"AI Narration failed: {e}")
+            return {"explanation": "Audit complete based on raw findings.", "suggested_fix": "Review results manually."}
+
+    async def _narrate_drift(self, *key) -> dict:
+        if key in self._narrations:
+            self._narrations.move_to_end(key)
+            return self._narrations[key]
+        narration = await self._narrate_drift_uncached(*key)
+        self._narrations[key] = narration
+        if len(self._narrations) > self.NARRATION_CACHE_SIZE:
+            self._narrations.popitem(last=False)
+        return narration
+
+    async def _narrate_drift_uncached(self, env_1: str, env_2: str, mode: str, resolved_path: str, issues: tuple) -> dict:
         prompt = (
             f"As an AI DevOps Specialist, interpret these configuration audit results.\n"
             f"Project Environment: {env_1}\n"
             f"Baseline Reference: {env_2}\n"
-            f"Resolved Path: {facts['resolved_path']}\n"
+            f"Resolved Path: {resolved_path}\n"
             f"Operation Mode: {mode}\n"
             f"Technical Findings: {', '.join(issues) if issues else 'NONE'}\n\n"
             "Return JSON with 'explanation' and 'suggested_fix'. Ensure the tone is 'respective' "
             "and professional. Explain the technical significance of any gaps."
         )
-        try:
-            return self.llm_client.generate_with_tools(prompt)
-        except Exception as e:
-            logger.error(f"AI Narration failed: {e}")
-            return {"explanation": "Audit complete based on raw findings.", "suggested_fix": "Review results manually."}
+        return await self.llm_client.generate_with_tools(prompt)
 
-    def _generate_error_narration(self, error_msg: str, path: str) -> dict:
+    async def _generate_error_narration(self, error_msg: str, path: str) -> dict:
         """Narrates a tool failure using AI to provide helpful context."""
         prompt = (
             f"The configuration auditor encountered a failure.\n"
@@ -97,6 +120,6 @@ class CompareEnvironmentConfigsTool:
             "Explain in plain, professional terms why this happened and how to fix it. Return JSON with 'explanation' and 'suggested_fix'."
         )
         try:
-            return self.llm_client.generate_with_tools(prompt)
+            return await self.llm_client.generate_with_tools(prompt)
         except:
             return {"explanation": f"System error: {error_msg}", "suggested_fix": "Verify file paths and permissions."}
@@ -2,6 +2,7 @@ from services.drivers.ci_driver import GitHubActionsDriver
 from services.llm_client import LLMClient
 from services.env_loader import FlexibleEnvLoader
 from datetime import datetime
+import asyncio
 import os
 import logging
 
@@ -13,10 +14,10 @@ class FetchBuildLogTool:
         self.llm_client = llm_client or LLMClient()
         self.default_repo = FlexibleEnvLoader.get_github_repo() 
 
-    async def execute(self, build_id: str, repo: str = None) -> dict:
+    async def execute(self, build_id: str, repo: str = None, max_chars: int = None) -> dict:
         target_repo = repo or self.default_repo
         if not target_repo:
-            error_narration = self._generate_error_narration("No repository specified.", build_id)
+            error_narration = await self._generate_error_narration("No repository specified.", build_id)
             return {
                 "success": False,
                 "error": {
@@ -28,10 +29,11 @@ class FetchBuildLogTool:
             }
 
         try:
-            log_text = self.driver.fetch_log(target_repo, build_id)
+            # The driver uses blocking requests; download in a worker thread so other checks keep running
+            log_text = await asyncio.to_thread(self.driver.fetch_log, target_repo, build_id, max_chars=max_chars)
             
             # AI Narration of the fetch event
-            ai_narration = self._generate_ai_status(target_repo, build_id, True)
+            ai_narration = await self._generate_ai_status(target_repo, build_id, True)
 
             return {
                 "success": True,
@@ -44,7 +46,7 @@ class FetchBuildLogTool:
                 }
             }
         except Exception as e:
-            error_narration = self._generate_error_narration(str(e), build_id, target_repo)
+            error_narration = await self._generate_error_narration(str(e), build_id, target_repo)
             return {
                 "success": False,
                 "error": {
@@ -55,7 +57,7 @@ class FetchBuildLogTool:
                 }
             }
 
-    def _generate_ai_status(self, repo: str, build_id: str, success: bool) -> dict:
+    async def _generate_ai_status(self, repo: str, build_id: str, success: bool) -> dict:
         """Briefly narrates the status of the log retrieval."""
         prompt = (
             f"As a DevOps Assistant, provide a brief, professional confirmation of log retrieval.\n"
@@ -65,11 +67,11 @@ class FetchBuildLogTool:
             "Return a JSON object with 'explanation'. The tone should be helpful and 'respective'."
         )
         try:
-            return self.llm_client.generate_with_tools(prompt)
+            return await self.llm_client.generate_with_tools(prompt)
         except:
             return {"explanation": f"Successfully retrieved logs for build {build_id}."}
 
-    def _generate_error_narration(self, error_msg: str, build_id: str, repo: str = "Unknown") -> dict:
+    async def _generate_error_narration(self, error_msg: str, build_id: str, repo: str = "Unknown") -> dict:
         """Narrates a log fetch failure using AI."""
         prompt = (
             f"The DevOps log fetcher encountered a failure.\n"
@@ -79,6 +81,6 @@ class FetchBuildLogTool:
             "Explain in professional terms why this happened. Return JSON with 'explanation' and 'suggested_fix'."
         )
         try:
-            return self.llm_client.generate_with_tools(prompt)
+            return await self.llm_client.generate_with_tools(prompt)
         except:
             return {"explanation": f"System error fetching log: {error_msg}", "suggested_fix": "Verify GitHub credentials."}
@@ -1,5 +1,6 @@
 from services.llm_client import LLMClient
 from services.config_service import ConfigService
+import asyncio
 import logging
 
 logger = logging.getLogger("fetch_config_tool")
@@ -13,10 +14,11 @@ class FetchEnvironmentConfigTool:
         try:
             # Real Configuration Fetching
             logger.info(f"Fetching configuration for environment: {environment}")
-            config = self.config_service.fetch_environment_config(environment)
+            # File reads and secret-store SDK calls block, so they run in a worker thread
+            config = await asyncio.to_thread(self.config_service.fetch_environment_config, environment)
             
             # AI Narration of the fetch event
-            ai_narration = self._generate_ai_status(environment, config, True)
+            ai_narration = await self._generate_ai_status(environment, config, True)
 
             return {
                 "success": True,
@@ -31,7 +33,7 @@ class FetchEnvironmentConfigTool:
             }
         except RuntimeError as e:
             # Configuration not found - proper error handling
-            error_narration = self._generate_error_narration(str(e), environment)
+            error_narration = await self._generate_error_narration(str(e), environment)
             return {
                 "success": False,
                 "error": {
@@ -43,7 +45,7 @@ class FetchEnvironmentConfigTool:
             }
         except Exception as e:
             # Unexpected error
-            error_narration = self._generate_error_narration(str(e), environment)
+            error_narration = await self._generate_error_narration(str(e), environment)
             return {
                 "success": False,
                 "error": {
@@ -54,7 +56,7 @@ class FetchEnvironmentConfigTool:
                 }
             }
 
-    def _generate_ai_status(self, env: str, config: dict, success: bool) -> dict:
+    async def _generate_ai_status(self, env: str, config: dict, success: bool) -> dict:
         """Briefly narrates the status of the configuration retrieval."""
         prompt = (
             f"As a Cloud Architect, provide a brief, professional confirmation of configuration retrieval.\n"
@@ -65,14 +67,14 @@ class FetchEnvironmentConfigTool:
             "Return a JSON object with 'explanation' and 'suggested_fix'. The tone should be authoritative and helpful."
         )
         try:
-            return self.llm_client.generate_with_tools(prompt)
+            return await self.llm_client.generate_with_tools(prompt)
         except:
             return {
                 "explanation": f"Environment configurations for {env} successfully synchronized. Retrieved {len(config)} configuration values.",
                 "suggested_fix": "No action required."
             }
 
-    def _generate_error_narration(self, error_msg: str, env: str) -> dict:
+    async def _generate_error_narration(self, error_msg: str, env: str) -> dict:
         """Narrates a config fetch failure using AI."""
         prompt = (
             f"The configuration loader encountered a failure for environment '{env}'.\n"
@@ -80,7 +82,7 @@ class FetchEnvironmentConfigTool:
             "Explain in professional terms why this happened. Return JSON with 'explanation' and 'suggested_fix'."
         )
         try:
-            return self.llm_client.generate_with_tools(prompt)
+            return await self.llm_client.generate_with_tools(prompt)
         except:
             return {
                 "explanation": f"Failed to load context for {env}: {error_msg}",
@@ -2,6 +2,7 @@ from services.drivers.ci_driver import GitHubActionsDriver
 from services.llm_client import LLMClient
 from services.env_loader import FlexibleEnvLoader
 from datetime import datetime
+import asyncio
 import os
 import logging
 
@@ -34,7 +35,7 @@ class GetLatestBuildTool:
         """
         target_repo = repo or self.default_repo
         if not target_repo:
-            error_narration = self._generate_error_narration("No repository specified.", None)
+            error_narration = await self._generate_error_narration("No repository specified.", None)
             return {
                 "success": False,
                 "error": {
@@ -48,7 +49,8 @@ class GetLatestBuildTool:
         try:
             # Discover the latest workflow run
             logger.info(f"Discovering latest workflow run for {target_repo}...")
-            latest_run = self.driver.get_latest_run(
+            latest_run = await asyncio.to_thread(
+                self.driver.get_latest_run,
                 repo=target_repo,
                 workflow_name=workflow_name,
                 branch=branch,
@@ -56,7 +58,7 @@ class GetLatestBuildTool:
             )
 
             if not latest_run:
-                error_narration = self._generate_error_narration(
+                error_narration = await self._generate_error_narration(
                     "No workflow runs found.",
                     target_repo,
                     workflow_name,
@@ -80,13 +82,13 @@ class GetLatestBuildTool:
             if include_log:
                 try:
                     logger.info(f"Fetching logs for run {run_id}...")
-                    log_text = self.driver.fetch_log(target_repo, str(run_id))
+                    log_text = await asyncio.to_thread(self.driver.fetch_log, target_repo, str(run_id))
                 except Exception as e:
                     logger.warning(f"Failed to fetch logs: {e}")
                     log_text = f"[Log fetch failed: {str(e)}]"
 
             # Generate AI analysis
-            ai_analysis = self._generate_ai_analysis(latest_run, log_text)
+            ai_analysis = await self._generate_ai_analysis(latest_run, log_text)
 
             return {
                 "success": True,
@@ -109,7 +111,7 @@ class GetLatestBuildTool:
 
         except Exception as e:
             logger.error(f"Error in get_latest_build: {e}")
-            error_narration = self._generate_error_narration(str(e), target_repo, workflow_name, branch)
+            error_narration = await self._generate_error_narration(str(e), target_repo, workflow_name, branch)
             return {
                 "success": False,
                 "error": {
@@ -120,7 +122,7 @@ class GetLatestBuildTool:
                 }
             }
 
-    def _generate_ai_analysis(self, run_info: dict, log_text: str = None) -> dict:
+    async def _generate_ai_analysis(self, run_info: dict, log_text: str = None) -> dict:
         """
         Generate AI-powered analysis of the build result.
         """
@@ -152,7 +154,7 @@ class GetLatestBuildTool:
 
         try:
             logger.info("Generating AI analysis of build result...")
-            return self.llm_client.generate_with_tools(prompt)
+            return await self.llm_client.generate_with_tools(prompt)
         except Exception as e:
             logger.error(f"AI analysis failed: {e}")
             # Fallback response
@@ -169,7 +171,7 @@ class GetLatestBuildTool:
                     "suggested_fix": "Review build logs manually."
                 }
 
-    def _generate_error_narration(self, error_msg: str, repo: str = None, 
+    async def _generate_error_narration(self, error_msg: str, repo: str = None, 
                                   workflow_name: str = None, branch: str = None) -> dict:
         """
         Generate AI-powered error explanation.
@@ -184,7 +186,7 @@ class GetLatestBuildTool:
         )
         
         try:
-            return self.llm_client.generate_with_tools(prompt)
+            return await self.llm_client.generate_with_tools(prompt)
         except:
             return {
                 "explanation": f"Error: {error_msg}",